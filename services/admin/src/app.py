@@ -1,6 +1,10 @@
+import threading
+import time
 from datetime import datetime, UTC
 from typing import Optional
+import orjson
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from .cognito_client import build_cognito_client, CognitoClient
 from .cognito_auth import build_verifier_from_env, CognitoVerifier
@@ -8,7 +12,22 @@ from .cognito_auth import build_verifier_from_env, CognitoVerifier
 # -------------------------
 # Config
 # -------------------------
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson for jsonify() and request parsing."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        # Datetimes go through Flask's default hook so they keep the HTTP-date format
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
 # Initialize Cognito client and verifier
@@ -46,6 +65,43 @@ def _get_user_by_email(email: str) -> Optional[dict]:
         return None
 
 
+def _json_body():
+    """Parse the request body as JSON whatever its Content-Type; {} if empty or invalid."""
+    try:
+        return orjson.loads(request.get_data(cache=False)) or {}
+    except orjson.JSONDecodeError:
+        return {}
+
+
+# The admin user listing costs a Cognito page fetch plus a group lookup per user,
+# so the public projection is cached and dropped whenever this service changes a user.
+_PUBLIC_USERS_TTL_SECONDS = 30.0
+_public_users_cache = {"value": None, "expires_at": 0.0}
+
+
+def _public_users() -> list:
+    """Return the public projection of up to 100 users, rebuilding it when stale."""
+    now = time.monotonic()
+    cached = _public_users_cache["value"]
+    if cached is not None and now < _public_users_cache["expires_at"]:
+        return cached
+    users = cognito_client.list_users(limit=100)
+    public_users = [{
+        "user_id": u["user_id"],
+        "name": u["name"],
+        "email": u["email"],
+        "role": u["role"],
+        "created_at": u["created_at"]
+    } for u in users]
+    _public_users_cache["value"] = public_users
+    _public_users_cache["expires_at"] = now + _PUBLIC_USERS_TTL_SECONDS
+    return public_users
+
+
+def _invalidate_public_users() -> None:
+    _public_users_cache["value"] = None
+
+
 # -------------------------
 # Helpers: JWT + Auth
 # -------------------------
@@ -105,14 +161,28 @@ def _get_user_by_email(email: str) -> Optional[dict]:
 # -------------------------
 # Health
 # -------------------------
+# Health probes arrive every few seconds; the user count only needs to be roughly current
+_USER_COUNT_TTL_SECONDS = 60.0
+_user_count_cache = {"value": 0, "expires_at": 0.0}
+
+
+def _cached_user_count() -> int:
+    """Return the Cognito user count, re-fetching at most once per TTL window."""
+    now = time.monotonic()
+    if now < _user_count_cache["expires_at"]:
+        return _user_count_cache["value"]
+    try:
+        total_users = cognito_client.count_users()
+    except Exception:
+        total_users = -1
+    _user_count_cache["value"] = total_users
+    _user_count_cache["expires_at"] = now + _USER_COUNT_TTL_SECONDS
+    return total_users
+
+
 @app.route("/healthz", methods=["GET"])
 def healthz():
-    total_users = 0
-    if cognito_client:
-        try:
-            total_users = cognito_client.count_users()
-        except Exception:
-            total_users = -1
+    total_users = _cached_user_count() if cognito_client else 0
     return jsonify({
         "status": "ok",
         "service": "admin-user-service",
@@ -123,6 +193,38 @@ def healthz():
     }), 200
 
 
+# Required registration fields, in the order they are reported when missing
+_REGISTER_FIELDS = ("name", "email", "password")
+_REGISTER_FIELD_SET = frozenset(_REGISTER_FIELDS)
+
+# Once the pool is known to have a user, nobody else can become the first ADMIN,
+# so register_user stops counting users. The lock keeps two concurrent first
+# registrations from both claiming ADMIN.
+_REG_LOCK = threading.Lock()
+_first_user_claimed = False
+
+
+def _claim_first_user() -> bool:
+    """Return True if this registration is the first user and should become ADMIN."""
+    global _first_user_claimed
+    with _REG_LOCK:
+        if _first_user_claimed:
+            return False
+        try:
+            has_users = cognito_client.has_users()
+        except Exception:
+            return False
+        _first_user_claimed = True
+        return not has_users
+
+
+def _release_first_user() -> None:
+    """Undo a first-user claim whose registration did not go through."""
+    global _first_user_claimed
+    with _REG_LOCK:
+        _first_user_claimed = False
+
+
 # -------------------------
 # API: Register new user
 # POST /api/users/register  {name, email, password}
@@ -133,10 +235,10 @@ def register_user():
     if not cognito_client:
         return jsonify({"error": "Cognito not configured"}), 500
     
-    data = request.get_json(force=True, silent=True) or {}
-    for field in ("name", "email", "password"):
-        if field not in data:
-            return jsonify({"error": f"Missing field: {field}"}), 400
+    data = _json_body()
+    if not _REGISTER_FIELD_SET.issubset(data):
+        field = next(f for f in _REGISTER_FIELDS if f not in data)
+        return jsonify({"error": f"Missing field: {field}"}), 400
 
     email = data["email"].lower()
     
@@ -146,13 +248,7 @@ def register_user():
         return jsonify({"error": "Email already exists"}), 409
 
     # Determine role: first user becomes ADMIN
-    role = "USER"
-    try:
-        user_count = cognito_client.count_users()
-        if user_count == 0:
-            role = "ADMIN"
-    except Exception:
-        pass
+    role = "ADMIN" if _claim_first_user() else "USER"
 
     try:
         # Create user in Cognito
@@ -162,6 +258,7 @@ def register_user():
             password=data["password"],
             role=role
         )
+        _invalidate_public_users()
         
         # Return public user info (without sensitive data)
         return jsonify({
@@ -172,8 +269,12 @@ def register_user():
             "created_at": user["created_at"]
         }), 201
     except ValueError as e:
+        if role == "ADMIN":
+            _release_first_user()
         return jsonify({"error": str(e)}), 400
     except Exception as e:
+        if role == "ADMIN":
+            _release_first_user()
         return jsonify({"error": f"Registration failed: {str(e)}"}), 500
 
 
@@ -187,7 +288,7 @@ def login():
     if not cognito_client:
         return jsonify({"error": "Cognito not configured"}), 500
     
-    data = request.get_json(force=True, silent=True) or {}
+    data = _json_body()
     email = (data.get("email") or "").lower()
     password = data.get("password")
     
@@ -258,7 +359,7 @@ def update_profile():
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    data = request.get_json(force=True, silent=True) or {}
+    data = _json_body()
     email = user["email"]
     
     try:
@@ -269,6 +370,8 @@ def update_profile():
             password=data.get("password"),
             role=None  # Don't allow users to change their own role
         )
+        if data.get("name"):
+            _invalidate_public_users()
         return jsonify({"message": "Profile updated"}), 200
     except Exception as e:
         return jsonify({"error": f"Update failed: {str(e)}"}), 500
@@ -288,16 +391,8 @@ def admin_list_users():
         return jsonify({"error": "Cognito not configured"}), 500
     
     try:
-        users = cognito_client.list_users(limit=100)
         # Return public user info
-        public_users = [{
-            "user_id": u["user_id"],
-            "name": u["name"],
-            "email": u["email"],
-            "role": u["role"],
-            "created_at": u["created_at"]
-        } for u in users]
-        return jsonify(public_users), 200
+        return jsonify(_public_users()), 200
     except Exception as e:
         return jsonify({"error": f"Failed to list users: {str(e)}"}), 500
 
@@ -319,6 +414,7 @@ def admin_delete_user(user_id):
     
     try:
         cognito_client.delete_user(user["email"])
+        _invalidate_public_users()
         return jsonify({"message": "User deleted"}), 200
     except Exception as e:
         return jsonify({"error": f"Failed to delete user: {str(e)}"}), 500
@@ -332,8 +428,7 @@ def _seed():
         return
     # Seed two users if User Pool is empty
     try:
-        user_count = cognito_client.count_users()
-        if user_count > 0:
+        if cognito_client.has_users():
             return
     except Exception:
         return
@@ -1,8 +1,11 @@
 """
 Cognito JWT token verification for admin service.
 """
+import functools
 import os
+import threading
 import time
+from collections import OrderedDict
 from typing import Dict, Optional, Tuple
 
 import httpx
@@ -25,71 +28,165 @@ class CognitoVerifier:
         self._jwks_cache: Optional[Dict] = None
         self._jwks_loaded_at: float = 0.0
         self._jwks_ttl_seconds: int = 3600
+        # Parsed RSA public keys by kid, rebuilt whenever the JWKS is replaced
+        self._key_cache: Dict[str, object] = {}
+        self._jwks_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing: bool = False
+        # One keep-alive client for every JWKS fetch made by this verifier
+        self._http = httpx.Client(timeout=5.0, http2=True, headers={"Accept": "application/json"})
+        # LRU of verified claims keyed by raw token, so repeat requests skip the RSA verify
+        self._claims_cache: "OrderedDict[str, dict]" = OrderedDict()
+        self._claims_cache_max: int = 4096
+        self._claims_lock = threading.Lock()
 
-    def _get_jwks(self) -> Dict:
-        """Get JWKS (JSON Web Key Set) from Cognito with caching."""
-        now = time.time()
-        if self._jwks_cache and (now - self._jwks_loaded_at) < self._jwks_ttl_seconds:
-            return self._jwks_cache
-        with httpx.Client(timeout=5.0) as client:
-            resp = client.get(self.jwks_url)
-            resp.raise_for_status()
-            self._jwks_cache = resp.json()
-            self._jwks_loaded_at = now
+    def _fetch_jwks(self) -> Dict:
+        """Download the JWKS (JSON Web Key Set) from Cognito."""
+        resp = self._http.get(self.jwks_url)
+        resp.raise_for_status()
+        jwks = resp.json()
+        # Callers only handle ValueError, so reject any other shape here
+        if not isinstance(jwks, dict) or not isinstance(jwks.get("keys"), list):
+            raise ValueError("JWKS response is not an object with a keys list")
+        return jwks
+
+    def close(self) -> None:
+        """Close the verifier's HTTP connection pool."""
+        self._http.close()
+
+    def _store_jwks(self, jwks: Dict) -> None:
+        """Swap in a new JWKS, parsing each RSA key once so verifies can reuse it."""
+        keys = {}
+        for key in jwks["keys"]:
+            kid = key.get("kid") if isinstance(key, dict) else None
+            if not kid:
+                continue
+            try:
+                keys[kid] = jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(key))
+            except jwt.exceptions.InvalidKeyError:
+                continue
+        self._key_cache = keys
+        self._jwks_cache = jwks
+        self._jwks_loaded_at = time.time()
+
+    def _get_jwks(self, force: bool = False) -> Dict:
+        """Get JWKS with caching; an expired copy is served while it refreshes in the background."""
+        cache = self._jwks_cache
+        if cache is not None and not force:
+            if (time.time() - self._jwks_loaded_at) >= self._jwks_ttl_seconds:
+                self._schedule_refresh()
+            return cache
+        # Nothing cached yet (or a forced refresh): callers must wait, but only one fetches
+        with self._jwks_lock:
+            if not force and self._jwks_cache is not None:
+                return self._jwks_cache
+            self._store_jwks(self._fetch_jwks())
             return self._jwks_cache
 
+    def _schedule_refresh(self) -> None:
+        """Start a background JWKS refresh unless one is already running."""
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_in_background, daemon=True).start()
+
+    def _refresh_in_background(self) -> None:
+        try:
+            jwks = self._fetch_jwks()
+            with self._jwks_lock:
+                self._store_jwks(jwks)
+        except Exception:
+            # Keep serving the stale keys; the next verify schedules another attempt
+            pass
+        finally:
+            self._refreshing = False
+
+    def _cached_claims(self, token: str) -> Optional[dict]:
+        """Return previously verified claims for this token if it has not expired."""
+        with self._claims_lock:
+            claims = self._claims_cache.get(token)
+            if claims is None:
+                return None
+            if claims.get("exp", 0) <= time.time():
+                del self._claims_cache[token]
+                return None
+            self._claims_cache.move_to_end(token)
+            return dict(claims)
+
+    def _remember_claims(self, token: str, claims: dict) -> None:
+        """Store verified claims, evicting the least recently used entry when full."""
+        with self._claims_lock:
+            self._claims_cache[token] = dict(claims)
+            self._claims_cache.move_to_end(token)
+            if len(self._claims_cache) > self._claims_cache_max:
+                self._claims_cache.popitem(last=False)
+
     def verify_authorization_header(self, auth_header: Optional[str]) -> Tuple[Optional[dict], Optional[str]]:
         """Verify Authorization header and return claims."""
-        if not auth_header or not auth_header.lower().startswith("bearer "):
+        # Case-fold only the 7-byte scheme rather than the whole header
+        if not auth_header or auth_header[:7].lower() != "bearer ":
             return None, "Missing or invalid Authorization header"
-        token = auth_header.split(" ", 1)[1].strip()
+        token = auth_header[7:].strip()
         return self.verify_token(token)
 
     def verify_token(self, token: str) -> Tuple[Optional[dict], Optional[str]]:
         """Verify JWT token and return claims."""
+        cached = self._cached_claims(token)
+        if cached is not None:
+            return cached, None
+        # Cheap shape check first so obviously malformed tokens never reach PyJWT
+        if not token or token.count(".") != 2:
+            return None, "Malformed token"
         try:
             unverified = jwt.get_unverified_header(token)
-            kid = unverified.get("kid")
-            if not kid:
-                return None, "Missing kid in token header"
+        except jwt.InvalidTokenError as e:
+            return None, str(e)
+        kid = unverified.get("kid")
+        if not kid:
+            return None, "Missing kid in token header"
 
-            jwks = self._get_jwks()
-            keys = jwks.get("keys", [])
-            key = next((k for k in keys if k.get("kid") == kid), None)
-            if not key:
+        try:
+            self._get_jwks()
+            public_key = self._key_cache.get(kid)
+            if public_key is None:
                 # refresh once in case of rotation
-                self._jwks_cache = None
-                jwks = self._get_jwks()
-                keys = jwks.get("keys", [])
-                key = next((k for k in keys if k.get("kid") == kid), None)
-                if not key:
-                    return None, "Signing key not found"
-
-            public_key = jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(key))
+                self._get_jwks(force=True)
+                public_key = self._key_cache.get(kid)
+        except (httpx.HTTPError, ValueError) as e:
+            return None, f"Could not load signing keys: {e}"
+        if public_key is None:
+            return None, "Signing key not found"
 
+        try:
             claims = jwt.decode(
                 token,
                 key=public_key,
                 algorithms=["RS256"],
                 audience=self.app_client_id,
                 issuer=self.issuer,
+                # "require" is PyJWT 2.x; "require_exp" is the pinned 1.7.1's spelling
+                options={"require": ["exp"], "require_exp": True},
             )
-            
-            # Extract role from Cognito groups or custom attribute
-            groups = claims.get("cognito:groups", [])
-            if "admin" in groups:
-                claims["role"] = "ADMIN"
-            elif "user" in groups or not groups:
-                claims["role"] = "USER"
-            else:
-                # Try custom attribute
-                claims["role"] = claims.get("custom:role", "USER")
-            
-            return claims, None
-        except Exception as e:
+        except jwt.InvalidTokenError as e:
             return None, str(e)
 
+        # Extract role from Cognito groups or custom attribute
+        groups = claims.get("cognito:groups", [])
+        if "admin" in groups:
+            claims["role"] = "ADMIN"
+        elif "user" in groups or not groups:
+            claims["role"] = "USER"
+        else:
+            # Try custom attribute
+            claims["role"] = claims.get("custom:role", "USER")
+
+        self._remember_claims(token, claims)
+        return claims, None
+
 
+# Shared instance so every caller hits the same JWKS and claims caches
+@functools.lru_cache(maxsize=1)
 def build_verifier_from_env() -> Optional[CognitoVerifier]:
     """Build CognitoVerifier from environment variables."""
     region = _env("COGNITO_REGION") or _env("AWS_REGION")
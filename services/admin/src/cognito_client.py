@@ -2,13 +2,50 @@
 Cognito User Pool client for user management.
 Handles user registration, authentication, and management through AWS Cognito.
 """
+import functools
 import os
+from concurrent.futures import ThreadPoolExecutor
+
 import boto3
-from botocore.exceptions import ClientError
+import jwt
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 from typing import Optional, List, Dict
 from datetime import datetime, UTC
 
 
+# Only the attributes the public user listing reads; Cognito otherwise returns
+# every standard and custom attribute for each user in the page.
+LIST_USERS_ATTRIBUTES = ['email', 'preferred_username', 'custom:role']
+
+# Concurrent admin_list_groups_for_user calls per page; the botocore connection
+# pool also covers list_users' page prefetch so no thread queues for a connection.
+GROUP_LOOKUP_WORKERS = 32
+
+# Shared by every list_users call: one worker per group lookup plus one for the
+# page prefetch. Workers never wait on each other, so concurrent listings just queue.
+LIST_USERS_EXECUTOR = ThreadPoolExecutor(
+    max_workers=GROUP_LOOKUP_WORKERS + 1, thread_name_prefix="cognito-list"
+)
+
+# Group name -> role, highest priority first. create_user makes lowercase groups;
+# the uppercase spellings some lookups used to check are accepted as well.
+ROLE_PRIORITY = (
+    ('admin', 'ADMIN'),
+    ('ADMIN', 'ADMIN'),
+    ('user', 'USER'),
+    ('USER', 'USER'),
+)
+
+
+def _derive_role(groups, custom_role: str) -> str:
+    """Map a user's Cognito groups to a role, falling back to the custom:role attribute."""
+    if not groups:
+        return 'USER'
+    group_set = frozenset(groups)
+    return next((role for group, role in ROLE_PRIORITY if group in group_set), custom_role).upper()
+
+
 class CognitoClient:
     """Client for managing users in AWS Cognito User Pool."""
     
@@ -16,7 +53,11 @@ class CognitoClient:
         self.region = region
         self.user_pool_id = user_pool_id
         self.app_client_id = app_client_id
-        self.client = boto3.client('cognito-idp', region_name=region)
+        self.client = boto3.client(
+            'cognito-idp',
+            region_name=region,
+            config=Config(max_pool_connections=GROUP_LOOKUP_WORKERS + 1),
+        )
     
     def create_user(self, email: str, name: str, password: str, role: str = "USER") -> Dict:
         """
@@ -82,7 +123,7 @@ class CognitoClient:
                     print(f"Warning: Could not add user to group: {e}")
             
             user_id = response['User']['Username']
-            created_at = response['User'].get('UserCreateDate', datetime.now(UTC)).isoformat()
+            created_at = (response['User'].get('UserCreateDate') or datetime.now(UTC)).isoformat()
             
             return {
                 'user_id': user_id,
@@ -136,15 +177,31 @@ class CognitoClient:
             if not id_token:
                 raise ValueError("Authentication failed: No token returned")
             
-            # Get user details to extract role
-            user_info = self.get_user_by_email(email)
+            # The ID token was just issued to us by Cognito over TLS, so its claims
+            # can be read without another signature check or admin_get_user call
+            claims = jwt.decode(
+                id_token,
+                options={'verify_signature': False},
+                audience=self.app_client_id,
+            )
+            if 'cognito:username' not in claims:
+                user_info = self.get_user_by_email(email)
+                return {
+                    'token': id_token,
+                    'user_id': user_info['user_id'],
+                    'role': user_info['role'],
+                    'email': email,
+                    'name': user_info['name']
+                }
+            
+            role = _derive_role(claims.get('cognito:groups', []), claims.get('custom:role', 'USER'))
             
             return {
                 'token': id_token,  # Return ID token for JWT verification
-                'user_id': user_info['user_id'],
-                'role': user_info['role'],
+                'user_id': claims['cognito:username'],
+                'role': role,
                 'email': email,
-                'name': user_info['name']
+                'name': claims.get('name', '')
             }
             
         except ClientError as e:
@@ -183,18 +240,14 @@ class CognitoClient:
             groups = [g['GroupName'] for g in groups_response.get('Groups', [])]
             
             # Determine role from groups or custom attribute
-            role = attributes.get('custom:role', 'USER')
-            if 'admin' in groups:
-                role = 'ADMIN'
-            elif 'user' in groups or not groups:
-                role = 'USER'
+            role = _derive_role(groups, attributes.get('custom:role', 'USER'))
             
             return {
                 'user_id': response['Username'],
                 'email': attributes.get('email', email),
                 'name': attributes.get('name', ''),
-                'role': role.upper(),
-                'created_at': response.get('UserCreateDate', datetime.now(UTC)).isoformat(),
+                'role': role,
+                'created_at': (response.get('UserCreateDate') or datetime.now(UTC)).isoformat(),
                 'enabled': response.get('Enabled', True)
             }
             
@@ -228,18 +281,14 @@ class CognitoClient:
             )
             groups = [g['GroupName'] for g in groups_response.get('Groups', [])]
             
-            role = attributes.get('custom:role', 'USER')
-            if 'ADMIN' in groups:
-                role = 'ADMIN'
-            elif 'USER' in groups or not groups:
-                role = 'USER'
+            role = _derive_role(groups, attributes.get('custom:role', 'USER'))
             
             return {
                 'user_id': response['Username'],
                 'email': attributes.get('email', user_id),
                 'name': attributes.get('preferred_username', ''),
-                'role': role.upper(),
-                'created_at': response.get('UserCreateDate', datetime.now(UTC)).isoformat(),
+                'role': role,
+                'created_at': (response.get('UserCreateDate') or datetime.now(UTC)).isoformat(),
                 'enabled': response.get('Enabled', True)
             }
             
@@ -288,26 +337,30 @@ class CognitoClient:
             
             # Update groups if role changed
             if role:
-                # Remove from all groups
-                groups_response = self.client.admin_list_groups_for_user(
-                    UserPoolId=self.user_pool_id,
-                    Username=email
-                )
-                for group in groups_response.get('Groups', []):
-                    self.client.admin_remove_user_from_group(
+                group_name = "admin" if role.upper() == "ADMIN" else "user"
+                current_groups = self._groups_for_or_raise(email)
+                
+                # Remove from every other group concurrently
+                stale_groups = [g for g in current_groups if g != group_name]
+                if stale_groups:
+                    with ThreadPoolExecutor(max_workers=min(8, len(stale_groups))) as pool:
+                        list(pool.map(
+                            lambda g: self.client.admin_remove_user_from_group(
+                                UserPoolId=self.user_pool_id,
+                                Username=email,
+                                GroupName=g
+                            ),
+                            stale_groups
+                        ))
+                
+                # Add to new group unless the user is already in it
+                if group_name not in current_groups:
+                    self._create_group_if_not_exists(group_name)
+                    self.client.admin_add_user_to_group(
                         UserPoolId=self.user_pool_id,
                         Username=email,
-                        GroupName=group['GroupName']
+                        GroupName=group_name
                     )
-                
-                # Add to new group
-                group_name = "admin" if role.upper() == "ADMIN" else "user"
-                self._create_group_if_not_exists(group_name)
-                self.client.admin_add_user_to_group(
-                    UserPoolId=self.user_pool_id,
-                    Username=email,
-                    GroupName=group_name
-                )
             
             return True
             
@@ -347,67 +400,91 @@ class CognitoClient:
         """
         try:
             users = []
-            pagination_token = None
+            params = {
+                'UserPoolId': self.user_pool_id,
+                'Limit': min(limit, 60),  # Cognito max is 60
+                'AttributesToGet': LIST_USERS_ATTRIBUTES
+            }
             
-            while True:
-                params = {
-                    'UserPoolId': self.user_pool_id,
-                    'Limit': min(limit, 60)  # Cognito max is 60
-                }
-                if pagination_token:
-                    params['PaginationToken'] = pagination_token
+            # One worker prefetches the next page while the rest look up groups
+            next_page = LIST_USERS_EXECUTOR.submit(self.client.list_users, **params)
+            while next_page is not None:
+                response = next_page.result()
+                page = response.get('Users', [])[:limit - len(users)]
+                
+                pagination_token = response.get('PaginationToken')
+                next_page = None
+                if pagination_token and len(users) + len(page) < limit:
+                    next_page = LIST_USERS_EXECUTOR.submit(
+                        self.client.list_users, **params, PaginationToken=pagination_token
+                    )
                 
-                response = self.client.list_users(**params)
+                # Fetch every user's groups for this page concurrently
+                page_groups = LIST_USERS_EXECUTOR.map(self._groups_for, [u['Username'] for u in page])
                 
-                for user in response.get('Users', []):
+                for user, groups in zip(page, page_groups):
                     attributes = {attr['Name']: attr['Value'] for attr in user.get('Attributes', [])}
                     
-                    # Get user groups
-                    try:
-                        groups_response = self.client.admin_list_groups_for_user(
-                            UserPoolId=self.user_pool_id,
-                            Username=user['Username']
-                        )
-                        groups = [g['GroupName'] for g in groups_response.get('Groups', [])]
-                    except:
-                        groups = []
-                    
-                    role = attributes.get('custom:role', 'USER')
-                    if 'ADMIN' in groups:
-                        role = 'ADMIN'
-                    elif 'USER' in groups or not groups:
-                        role = 'USER'
+                    role = _derive_role(groups, attributes.get('custom:role', 'USER'))
                     
                     users.append({
                         'user_id': user['Username'],
                         'email': attributes.get('email', user['Username']),
                         'name': attributes.get('preferred_username', ''),
-                        'role': role.upper(),
-                        'created_at': user.get('UserCreateDate', datetime.now(UTC)).isoformat(),
+                        'role': role,
+                        'created_at': (user.get('UserCreateDate') or datetime.now(UTC)).isoformat(),
                         'enabled': user.get('Enabled', True)
                     })
-                
-                pagination_token = response.get('PaginationToken')
-                if not pagination_token or len(users) >= limit:
-                    break
             
-            return users[:limit]
+            return users
             
         except ClientError as e:
             raise Exception(f"Failed to list users: {e.response['Error']['Message']}")
     
+    def _groups_for_or_raise(self, username: str) -> List[str]:
+        """Return the group names for a user."""
+        groups_response = self.client.admin_list_groups_for_user(
+            UserPoolId=self.user_pool_id,
+            Username=username
+        )
+        return [g['GroupName'] for g in groups_response.get('Groups', [])]
+    
+    def _groups_for(self, username: str) -> List[str]:
+        """Return the group names for a user, or an empty list if the lookup fails."""
+        try:
+            return self._groups_for_or_raise(username)
+        except (ClientError, BotoCoreError):
+            return []
+    
+    def has_users(self) -> bool:
+        """
+        Check whether the User Pool has at least one user.
+        
+        Exact, unlike count_users: asks list_users for a single user.
+        
+        Returns:
+            True if the pool is not empty
+        """
+        try:
+            response = self.client.list_users(UserPoolId=self.user_pool_id, Limit=1)
+            return bool(response.get('Users'))
+        except ClientError as e:
+            raise Exception(f"Failed to list users: {e.response['Error']['Message']}")
+    
     def count_users(self) -> int:
         """
         Get total number of users in the User Pool.
         
+        Reads the pool's EstimatedNumberOfUsers in a single API call rather
+        than paging through every user. The estimate can lag, so use has_users
+        for decisions such as granting the first user ADMIN.
+        
         Returns:
-            Number of users
+            Approximate number of users
         """
         try:
-            # List all users and count them
-            # Note: For better performance in production, consider using CloudWatch metrics
-            users = self.list_users(limit=10000)  # Large limit to get all users
-            return len(users)
+            response = self.client.describe_user_pool(UserPoolId=self.user_pool_id)
+            return response['UserPool'].get('EstimatedNumberOfUsers', 0)
         except ClientError:
             # Fallback: return -1 to indicate error
             return -1
@@ -427,6 +504,8 @@ class CognitoClient:
                 raise
 
 
+# Building a boto3 client parses the service model, so do it once per process
+@functools.lru_cache(maxsize=1)
 def build_cognito_client() -> Optional[CognitoClient]:
     """
     Build CognitoClient from environment variables.
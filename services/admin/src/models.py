@@ -6,7 +6,7 @@ import uuid
 # ---------- Users ----------
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     user_id: str
     name: str
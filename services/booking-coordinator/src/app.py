@@ -1,9 +1,15 @@
 import json
+import logging
 import uuid
 import boto3
+import orjson
 import os
+import threading
+import time
 from datetime import datetime, timedelta, timezone
+from decimal import Decimal
 from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS, cross_origin
 from config import (
     ADMIN_SERVICE_URL, BOOKING_SERVICE_URL, PAYMENT_SERVICE_URL, 
@@ -14,18 +20,29 @@ from clients import post_json, _auth_headers, request_json
 from auth import build_verifier_from_env
 
 
+class OrjsonRequestProvider(DefaultJSONProvider):
+    """Parse request bodies with orjson; responses keep Flask's default encoder."""
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
+log = logging.getLogger(__name__)
+
 app = Flask(__name__)
+app.json = OrjsonRequestProvider(app)
 CORS(app)
 _verifier = build_verifier_from_env()
 
 # At the top of app.py after _verifier = build_verifier_from_env()
 if _verifier:
-    print("[AUTH] JWT verification ENABLED")
+    log.info("[AUTH] JWT verification ENABLED")
 else:
-    print("[AUTH] JWT verification DISABLED - missing env vars")
-    print(f"  COGNITO_REGION: {os.environ.get('COGNITO_REGION')}")
-    print(f"  COGNITO_USER_POOL_ID: {os.environ.get('COGNITO_USER_POOL_ID')}")
-    print(f"  COGNITO_APP_CLIENT_ID: {os.environ.get('COGNITO_APP_CLIENT_ID')}")
+    log.warning("[AUTH] JWT verification DISABLED - missing env vars")
+    log.warning("  COGNITO_REGION: %s", os.environ.get('COGNITO_REGION'))
+    log.warning("  COGNITO_USER_POOL_ID: %s", os.environ.get('COGNITO_USER_POOL_ID'))
+    log.warning("  COGNITO_APP_CLIENT_ID: %s", os.environ.get('COGNITO_APP_CLIENT_ID'))
 
 # Intialize Cognito client 
 cognito = boto3.client("cognito-idp", region_name=AWS_REGION)
@@ -34,11 +51,30 @@ cognito_pool_id = os.environ.get("COGNITO_USER_POOL_ID")
 # Initialize SQS client
 sqs = boto3.client('sqs', region_name=AWS_REGION)
 
+# (service, endpoint) pairs the gateway forwards without verifying a JWT
+_PUBLIC_ENDPOINTS = frozenset({
+    ("admin", "/api/users/login"),
+    ("admin", "/api/users/register"),
+})
+
+# Required request fields, kept in the order they are reported when missing
+_BOOKING_FIELDS = ("event_id", "num_tickets", "user_id", "amount", "currency")
+_BOOKING_FIELD_SET = frozenset(_BOOKING_FIELDS)
+_CONFIRM_FIELDS = ("payment_id", "booking_id")
+_CONFIRM_FIELD_SET = frozenset(_CONFIRM_FIELDS)
+
+
+def _missing_field(data, fields, field_set):
+    """Return the first of ``fields`` absent from ``data``, or None if all are present."""
+    if field_set.issubset(data):
+        return None
+    return next(f for f in fields if f not in data)
+
 
 @app.get("/healthz")
 def healthz():
     """Liveness/health endpoint so clients can verify the service is up."""
-    print("Health check LATEST!!!")
+    log.debug("Health check")
     return jsonify({
         "status": "ok",
         "service": "booking-coordinator"
@@ -61,9 +97,9 @@ def orchestrate_booking_async():
             return jsonify({"error": {"code": "UNAUTHORIZED", "message": err}}), 401
 
     data = request.get_json() or {}
-    for f in ("event_id", "num_tickets", "user_id", "amount", "currency"):
-        if f not in data:
-            return jsonify({"error": {"code": "BAD_REQUEST", "message": f"Missing {f}"}}), 400
+    missing = _missing_field(data, _BOOKING_FIELDS, _BOOKING_FIELD_SET)
+    if missing:
+        return jsonify({"error": {"code": "BAD_REQUEST", "message": f"Missing {missing}"}}), 400
 
     # Generate unique request ID
     request_id = str(uuid.uuid4())
@@ -103,7 +139,7 @@ def orchestrate_booking_async():
         }), 202  # 202 Accepted
         
     except Exception as e:
-        print(f"SQS Error: {str(e)}")
+        log.error("SQS Error: %s", e)
         return jsonify({
             "error": {
                 "code": "QUEUE_ERROR",
@@ -111,45 +147,89 @@ def orchestrate_booking_async():
             }
         }), 500
 
+def _convert_decimals(obj):
+    """Convert DynamoDB Decimals to int when integral, float otherwise, for JSON."""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, dict):
+        return {k: _convert_decimals(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_convert_decimals(i) for i in obj]
+    return obj
+
+
+# Clients poll the status endpoint until the worker finishes. The worker only writes
+# the terminal status, so a request still in flight reads as not found; serve those
+# repeat polls from memory for a short window.
+_status_table = boto3.resource('dynamodb', region_name=AWS_REGION).Table('booking-requests-status')
+_STATUS_CACHE_TTL_SECONDS = 1.0
+_STATUS_CACHE_MAX_ENTRIES = 50000
+_IN_FLIGHT_STATUSES = frozenset({"not_found"})
+_status_cache = {}
+_status_cache_lock = threading.Lock()
+
+
+def _cached_status(request_id: str):
+    """Return a cached (body, http_status) for ``request_id`` if it has not expired."""
+    with _status_cache_lock:
+        entry = _status_cache.get(request_id)
+        if entry is None:
+            return None
+        expires_at, body, http_status = entry
+        if expires_at <= time.monotonic():
+            del _status_cache[request_id]
+            return None
+        return body, http_status
+
+
+def _store_status(request_id: str, body: dict, http_status: int):
+    """Cache in-flight statuses; terminal ones drop any cached entry."""
+    with _status_cache_lock:
+        if body["status"] not in _IN_FLIGHT_STATUSES:
+            _status_cache.pop(request_id, None)
+            return
+        now = time.monotonic()
+        if len(_status_cache) >= _STATUS_CACHE_MAX_ENTRIES:
+            for key in [k for k, (exp, _, _) in _status_cache.items() if exp <= now]:
+                del _status_cache[key]
+            if len(_status_cache) >= _STATUS_CACHE_MAX_ENTRIES:
+                return
+        _status_cache[request_id] = (now + _STATUS_CACHE_TTL_SECONDS, body, http_status)
+
+
 @app.get("/api/orch/bookings/status/<request_id>")
 def check_booking_status(request_id: str):
     """
     Check the status of a queued booking request from DynamoDB.
     """
-    from decimal import Decimal
     from botocore.exceptions import ClientError
     
-    dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
-    status_table = dynamodb.Table('booking-requests-status')
-    
+    cached = _cached_status(request_id)
+    if cached is not None:
+        body, http_status = cached
+        return jsonify(body), http_status
+
     try:
-        response = status_table.get_item(Key={'request_id': request_id})
+        response = _status_table.get_item(Key={'request_id': request_id})
         
         if 'Item' not in response:
-            return jsonify({
+            body = {
                 "request_id": request_id,
                 "status": "not_found",
                 "message": "Request not found. It may still be queued or the worker hasn't processed it yet."
-            }), 404
+            }
+            _store_status(request_id, body, 404)
+            return jsonify(body), 404
         
         item = response['Item']
-        
-        # Convert Decimal to float for JSON
-        def convert_decimals(obj):
-            if isinstance(obj, Decimal):
-                return float(obj) if obj % 1 else int(obj)
-            if isinstance(obj, dict):
-                return {k: convert_decimals(v) for k, v in obj.items()}
-            if isinstance(obj, list):
-                return [convert_decimals(i) for i in obj]
-            return obj
-        
-        return jsonify({
+        body = {
             "request_id": request_id,
             "status": item.get('status'),
-            "data": convert_decimals(item.get('data', {})),
+            "data": _convert_decimals(item.get('data', {})),
             "updated_at": item.get('updated_at')
-        }), 200
+        }
+        _store_status(request_id, body, 200)
+        return jsonify(body), 200
         
     except ClientError as e:
         error_code = e.response.get('Error', {}).get('Code', '')
@@ -161,7 +241,7 @@ def check_booking_status(request_id: str):
                 "message": "Status table not created yet. Run create_status_table.py to create it."
             }), 503  # Service Unavailable
         else:
-            print(f"Error checking status: {str(e)}")
+            log.error("Error checking status: %s", e)
             return jsonify({
                 "error": {
                     "code": "STATUS_ERROR",
@@ -169,7 +249,7 @@ def check_booking_status(request_id: str):
                 }
             }), 500
     except Exception as e:
-        print(f"Error checking status: {str(e)}")
+        log.error("Error checking status: %s", e)
         return jsonify({
             "error": {
                 "code": "STATUS_ERROR",
@@ -184,7 +264,7 @@ def orchestrate_booking_sync():
     Synchronous booking endpoint (original implementation).
     Use this for testing or immediate processing.
     """
-    print("Synchronous booking endpoint called")
+    log.debug("Synchronous booking endpoint called")
     claims = None
     if _verifier:
         claims, err = _verifier.verify_authorization_header(request.headers.get("Authorization"))
@@ -192,9 +272,9 @@ def orchestrate_booking_sync():
             return jsonify({"error": {"code": "UNAUTHORIZED", "message": err}}), 401
 
     data = request.get_json() or {}
-    for f in ("event_id", "num_tickets", "user_id", "amount", "currency"):
-        if f not in data:
-            return jsonify({"error": {"code": "BAD_REQUEST", "message": f"Missing {f}"}}), 400
+    missing = _missing_field(data, _BOOKING_FIELDS, _BOOKING_FIELD_SET)
+    if missing:
+        return jsonify({"error": {"code": "BAD_REQUEST", "message": f"Missing {missing}"}}), 400
 
     headers = _auth_headers(request.headers)
     effective_user_id = (claims or {}).get("sub") if claims else data.get("user_id")
@@ -219,9 +299,9 @@ def orchestrate_booking_fifo_hybrid():
             return jsonify({"error": {"code": "UNAUTHORIZED", "message": err}}), 401
 
     data = request.get_json() or {}
-    for f in ("event_id", "num_tickets", "user_id", "amount", "currency"):
-        if f not in data:
-            return jsonify({"error": {"code": "BAD_REQUEST", "message": f"Missing {f}"}}), 400
+    missing = _missing_field(data, _BOOKING_FIELDS, _BOOKING_FIELD_SET)
+    if missing:
+        return jsonify({"error": {"code": "BAD_REQUEST", "message": f"Missing {missing}"}}), 400
 
     headers = _auth_headers(request.headers)
     effective_user_id = (claims or {}).get("sub") if claims else data.get("user_id")
@@ -243,7 +323,7 @@ def orchestrate_booking_fifo_hybrid():
         payment_id = booking_response.get("payment", {}).get("payment_id")
     except Exception as e:
         # If we can't parse the response, log but continue (SQS audit is optional)
-        print(f"[WARN] Failed to parse booking response for SQS audit: {str(e)}")
+        log.warning("Failed to parse booking response for SQS audit: %s", e)
         booking_id = None
         payment_id = None
     
@@ -279,7 +359,7 @@ def orchestrate_booking_fifo_hybrid():
         )
     except Exception as e:
         # Log error but don't fail the request (SQS is for audit, not critical path)
-        print(f"[WARN] Failed to send audit message to SQS: {str(e)}")
+        log.warning("Failed to send audit message to SQS: %s", e)
     
     # Step 4: Return immediate response with client_secret
     return booking_result
@@ -298,9 +378,10 @@ def _process_booking(data, user_id, headers):
     if "seat_numbers" in data and data["seat_numbers"]:
         booking_data["seat_numbers"] = data["seat_numbers"]
 
-    print("Booking URL:", book_url)
-    print("Booking data:", booking_data)
-    print("Headers:", headers)
+    # Header values carry the caller's bearer token, so only their names are logged
+    log.debug("Booking URL: %s", book_url)
+    log.debug("Booking data: %s", booking_data)
+    log.debug("Headers: %s", list(headers))
     
     book_res = post_json(book_url, booking_data, headers)
     if book_res.status_code >= 400:
@@ -320,20 +401,17 @@ def _process_booking(data, user_id, headers):
         "currency": data["currency"],
     }, headers)
 
-    print("PAYMENT URL:", pay_url)
-    print("PAYMENT REQUEST:", {
-        "booking_id": booking_id,
-        "amount": data["amount"],
-        "currency": data["currency"],
-    })
-    print("PAYMENT RESPONSE:", pay_res.status_code, pay_res.text)
+    log.debug("Payment URL: %s", pay_url)
+    log.debug("Payment request: booking_id=%s amount=%s currency=%s",
+              booking_id, data["amount"], data["currency"])
+    log.debug("Payment response: %s %s", pay_res.status_code, pay_res.text)
 
 
     if pay_res.status_code >= 400:
         return jsonify({"error": {"code": "PAYMENT_INTENT_FAILED", "message": pay_res.text}}), 400
 
     payment = pay_res.json()
-    print("PAYMENT SERVICE RESPONSE JSON:", payment)
+    log.debug("Payment service response JSON: %s", payment)
     return jsonify({
         "success": True,
         "booking": booking,
@@ -363,9 +441,9 @@ def orchestrate_booking_and_notify():
             return jsonify({"error": {"code": "UNAUTHORIZED", "message": err}}), 401
 
     data = request.get_json() or {}
-    for f in ("event_id", "num_tickets", "user_id", "amount", "currency"):
-        if f not in data:
-            return jsonify({"error": {"code": "BAD_REQUEST", "message": f"Missing {f}"}}), 400
+    missing = _missing_field(data, _BOOKING_FIELDS, _BOOKING_FIELD_SET)
+    if missing:
+        return jsonify({"error": {"code": "BAD_REQUEST", "message": f"Missing {missing}"}}), 400
 
     headers = _auth_headers(request.headers)
 
@@ -447,9 +525,9 @@ def orchestrate_payment_confirm():
     """Confirm a pending payment by forwarding to the payment service.
     Verifies the payment intent with Stripe."""
     data = request.get_json() or {}
-    for f in ("payment_id", "booking_id"):
-        if f not in data:
-            return jsonify({"error": {"code": "BAD_REQUEST", "message": f"Missing {f}"}}), 400
+    missing = _missing_field(data, _CONFIRM_FIELDS, _CONFIRM_FIELD_SET)
+    if missing:
+        return jsonify({"error": {"code": "BAD_REQUEST", "message": f"Missing {missing}"}}), 400
 
     headers = _auth_headers(request.headers)
     url = f"{PAYMENT_SERVICE_URL}/api/payments/verify-intent"
@@ -505,28 +583,22 @@ def proxy_to_service():
     data = payload.get("data")
 
     # Endpoints that don't require authentication
-    allow_unauth = (service == "admin" and endpoint in ("/api/users/login", "/api/users/register"))
+    allow_unauth = (service, endpoint) in _PUBLIC_ENDPOINTS
 
     # ============ ENHANCED AUTH DEBUGGING ============
     auth_header = request.headers.get("Authorization")
-    print("=" * 80)
-    print("[DEBUG] PROXY REQUEST DETAILS:")
-    print(f"  Service: {service}")
-    print(f"  Endpoint: {endpoint}")
-    print(f"  Method: {method}")
-    print(f"  Allow Unauth: {allow_unauth}")
-    print(f"  Auth Header Present: {bool(auth_header)}")
-    print(f"  Verifier Initialized: {bool(_verifier)}")
-    if auth_header:
-        print(f"  Auth Header (first 50 chars): {auth_header[:50]}...")
-    print("=" * 80)
+    log.debug(
+        "Proxy request: service=%s endpoint=%s method=%s allow_unauth=%s "
+        "auth_header_present=%s verifier_initialized=%s",
+        service, endpoint, method, allow_unauth, bool(auth_header), bool(_verifier),
+    )
 
     # Auth validation
     claims = None
     if not allow_unauth:
         # Check if auth is configured
         if not _verifier:
-            print("[ERROR] Authentication verifier not initialized - check environment variables")
+            log.error("Authentication verifier not initialized - check environment variables")
             return jsonify({
                 "success": False,
                 "message": "Authentication not configured on server. Missing Cognito environment variables."
@@ -534,7 +606,7 @@ def proxy_to_service():
 
         # Check if auth header is present
         if not auth_header:
-            print("[ERROR] Missing Authorization header")
+            log.info("Missing Authorization header")
             return jsonify({
                 "success": False,
                 "message": "Missing Authorization header. Please include 'Authorization: Bearer <token>' in your request."
@@ -543,13 +615,13 @@ def proxy_to_service():
         # Verify the token
         claims, err = _verifier.verify_authorization_header(auth_header)
         if err:
-            print(f"[ERROR] Token verification failed: {err}")
+            log.info("Token verification failed: %s", err)
             return jsonify({
                 "success": False,
                 "message": f"Authentication failed: {err}"
             }), 401
 
-        print(f"[SUCCESS] Token verified for user: {claims.get('sub', 'unknown')}")
+        log.debug("Token verified for user: %s", claims.get('sub', 'unknown'))
 
         # Enforce admin-only for admin endpoints when auth is enabled
         if endpoint.startswith("/api/admin"):
@@ -557,10 +629,10 @@ def proxy_to_service():
             role_claim = claims.get("role")
             is_admin = (isinstance(groups, list) and ("ADMIN" in groups)) or role_claim == "ADMIN"
             
-            print(f"[DEBUG] Admin check - Groups: {groups}, Role: {role_claim}, Is Admin: {is_admin}")
+            log.debug("Admin check - Groups: %s, Role: %s, Is Admin: %s", groups, role_claim, is_admin)
             
             if not is_admin:
-                print("[ERROR] User is not admin but tried to access admin endpoint")
+                log.info("User is not admin but tried to access admin endpoint")
                 return jsonify({
                     "success": False,
                     "message": "Forbidden: admin role required"
@@ -568,7 +640,7 @@ def proxy_to_service():
 
     # Validate required fields
     if not service or not endpoint:
-        print("[ERROR] Missing required fields in request")
+        log.info("Missing required fields in request")
         return jsonify({
             "success": False,
             "message": "Missing required fields: service, endpoint"
@@ -588,7 +660,7 @@ def proxy_to_service():
 
     base = base_url_map.get(service)
     if not base:
-        print(f"[ERROR] Unknown service: {service}")
+        log.info("Unknown service: %s", service)
         return jsonify({
             "success": False,
             "message": f"Unknown service: {service}. Valid services: {', '.join(base_url_map.keys())}"
@@ -600,45 +672,46 @@ def proxy_to_service():
 
     target_url = f"{base}{endpoint}"
     
-    print(f"[INFO] Proxying request:")
-    print(f"  Target URL: {target_url}")
-    print(f"  Method: {method}")
-    print(f"  Has Data: {bool(data)}")
+    log.debug("Proxying request: target_url=%s method=%s has_data=%s",
+              target_url, method, bool(data))
 
     # Build headers for downstream service
     headers = _auth_headers(request.headers)
     
     # Inject user context for downstream services
-    if not allow_unauth and _verifier and claims:
+    if claims:
         headers["X-User-Id"] = claims.get("sub", "")
         roles = claims.get("cognito:groups") or []
         if isinstance(roles, list):
             headers["X-User-Roles"] = ",".join(roles)
         
-        print(f"[INFO] Injected user context headers:")
-        print(f"  X-User-Id: {headers.get('X-User-Id')}")
-        print(f"  X-User-Roles: {headers.get('X-User-Roles')}")
+        log.debug("Injected user context headers: X-User-Id=%s X-User-Roles=%s",
+                  headers.get('X-User-Id'), headers.get('X-User-Roles'))
 
     # For GET, treat data as query params; otherwise send JSON body
     params = data if (method == "GET" and isinstance(data, dict)) else None
     json_body = None if method == "GET" else data
 
-    # Handle case where json_body is a string (parse it)
+    # Encode the body once; a string that is already JSON is forwarded as-is
+    content = None
     if isinstance(json_body, str):
         try:
-            json_body = json.loads(json_body)
-            print("[INFO] Parsed string data as JSON")
-        except Exception as e:
-            print(f"[WARN] Could not parse data string as JSON: {e}")
+            orjson.loads(json_body)
+            content = json_body.encode("utf-8")
+            log.debug("Forwarding string data as JSON")
+        except orjson.JSONDecodeError as e:
+            log.warning("Could not parse data string as JSON: %s", e)
+    if content is None and json_body is not None:
+        content = orjson.dumps(json_body)
 
     # Make the request to downstream service
     try:
-        print(f"[INFO] Sending request to downstream service...")
-        res = request_json(method, target_url, headers=headers, json=json_body, params=params)
-        print(f"[INFO] Downstream service responded with status: {res.status_code}")
+        log.debug("Sending request to downstream service...")
+        res = request_json(method, target_url, headers=headers, params=params, content=content)
+        log.debug("Downstream service responded with status: %s", res.status_code)
         
     except Exception as e:
-        print(f"[ERROR] Request to downstream service failed: {str(e)}")
+        log.error("Request to downstream service failed: %s", e)
         return jsonify({
             "success": False,
             "message": f"Failed to connect to {service} service: {str(e)}"
@@ -647,10 +720,10 @@ def proxy_to_service():
     # Attempt to pass through JSON response; on non-JSON, wrap as text
     try:
         body = res.json()
-        print(f"[INFO] Response body: {json.dumps(body, indent=2)[:500]}...")
+        log.debug("Response body: %.500s", body)
     except Exception as e:
         body = {"message": res.text}
-        print(f"[WARN] Non-JSON response from downstream service: {res.text[:200]}")
+        log.warning("Non-JSON response from downstream service: %.200s", res.text)
 
     status = res.status_code
     success = 200 <= status < 300
@@ -661,8 +734,7 @@ def proxy_to_service():
         "message": None if success else body.get("error") or body.get("message") or "Request failed"
     }
     
-    print(f"[INFO] Returning response - Success: {success}, Status: {status}")
-    print("=" * 80)
+    log.debug("Returning response - Success: %s, Status: %s", success, status)
     
     return jsonify(result), status
 
@@ -706,19 +778,19 @@ def get_events_starting_soon():
     by calling the Ticket-Booking microservice's /api/events/starting-soon endpoint.
     """
     try:
-        print("[INFO] Fetching 'starting-soon' events from booking service...")
+        log.info("Fetching 'starting-soon' events from booking service...")
         events_url = f"{BOOKING_SERVICE_URL}/api/events/starting-soon"
 
         # Use the same internal helper you use for other services
         res = request_json("GET", events_url, headers={})
 
         if res.status_code >= 400:
-            print(f"[ERROR] Booking service returned {res.status_code}: {res.text}")
+            log.error("Booking service returned %s: %s", res.status_code, res.text)
             return []
 
         payload = res.json()
         events = payload.get("events", [])
-        print(f"[INFO] Retrieved {len(events)} upcoming events from booking service")
+        log.info("Retrieved %d upcoming events from booking service", len(events))
         
         # Optionally, normalize structure before returning
         normalized = [
@@ -734,7 +806,7 @@ def get_events_starting_soon():
         return normalized
 
     except Exception as e:
-        print(f"[ERROR] Failed to fetch events from booking service: {e}")
+        log.error("Failed to fetch events from booking service: %s", e)
         return []
 
 def enqueue_notifications(payload: dict):
@@ -744,10 +816,10 @@ def enqueue_notifications(payload: dict):
             QueueUrl=SQS_NOTIFICATION_QUEUE_URL,
             MessageBody=json.dumps(payload)
         )
-        print(f"[SQS] Enqueued notification: {payload} → MessageId={response['MessageId']}")
+        log.info("Enqueued notification: %s → MessageId=%s", payload, response['MessageId'])
         return response
     except Exception as e:
-        print(f"[ERROR] Failed to enqueue SQS message: {e}")
+        log.error("Failed to enqueue SQS message: %s", e)
         return None
     
 @app.post("/internal/scheduler-trigger")
@@ -756,9 +828,9 @@ def scheduler_trigger():
     users = get_all_cognito_users()          # query Cognito
     user_map = {u["username"]: u["email"] for u in users}
 
-    print(f"Trigger caller")
-    print(f"Events fetched: {events}")
-    print(f"Users fetched: {users}")
+    log.debug("Scheduler trigger called")
+    log.debug("Events fetched: %s", events)
+    log.debug("Users fetched: %s", users)
 
     for event in events:
         for user in event["user_ids"]:
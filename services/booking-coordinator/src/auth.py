@@ -1,10 +1,14 @@
+import logging
 import os
+import threading
 import time
 from typing import Dict, Optional, Tuple
 import httpx
 import jwt
 import json
 
+log = logging.getLogger(__name__)
+
 
 def _env(name: str, default: Optional[str] = None) -> Optional[str]:
     return os.getenv(name, default)
@@ -20,18 +24,35 @@ class CognitoVerifier:
         self._jwks_cache: Optional[Dict] = None
         self._jwks_loaded_at: float = 0.0
         self._jwks_ttl_seconds: int = 3600
+        self._jwks_lock = threading.Lock()
+        # One keep-alive client for every JWKS fetch made by this verifier
+        self._http = httpx.Client(
+            timeout=5.0,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=4),
+        )
 
-    def _get_jwks(self) -> Dict:
-        now = time.time()
-        if self._jwks_cache and (now - self._jwks_loaded_at) < self._jwks_ttl_seconds:
-            return self._jwks_cache
-        with httpx.Client(timeout=5.0) as client:
-            resp = client.get(self.jwks_url)
+    def _get_jwks(self, force: bool = False) -> Dict:
+        cache = self._jwks_cache
+        if not force and cache and (time.time() - self._jwks_loaded_at) < self._jwks_ttl_seconds:
+            return cache
+        with self._jwks_lock:
+            # Another thread may have refreshed while we waited for the lock
+            if self._jwks_cache is not cache and self._jwks_cache:
+                return self._jwks_cache
+            resp = self._http.get(self.jwks_url)
             resp.raise_for_status()
             self._jwks_cache = resp.json()
-            self._jwks_loaded_at = now
+            self._jwks_loaded_at = time.time()
             return self._jwks_cache
 
+    def prefetch_jwks(self) -> None:
+        """Warm the JWKS cache so the first request does not pay for the fetch."""
+        try:
+            self._get_jwks()
+        except (httpx.HTTPError, ValueError) as e:
+            # ValueError covers a non-JSON or truncated JWKS body
+            log.warning("JWKS prefetch failed, will retry on first request: %s", e)
+
     def verify_authorization_header(self, auth_header: Optional[str]) -> Tuple[Optional[dict], Optional[str]]:
         if not auth_header or not auth_header.lower().startswith("bearer "):
             return None, "Missing or invalid Authorization header"
@@ -50,8 +71,7 @@ class CognitoVerifier:
             key = next((k for k in keys if k.get("kid") == kid), None)
             if not key:
                 # refresh once in case of rotation
-                self._jwks_cache = None
-                jwks = self._get_jwks()
+                jwks = self._get_jwks(force=True)
                 keys = jwks.get("keys", [])
                 key = next((k for k in keys if k.get("kid") == kid), None)
                 if not key:
@@ -85,6 +105,8 @@ def build_verifier_from_env() -> Optional[CognitoVerifier]:
     client_id = _env("COGNITO_APP_CLIENT_ID")
     if not (region and pool and client_id):
         return None
-    return CognitoVerifier(region, pool, client_id)
+    verifier = CognitoVerifier(region, pool, client_id)
+    verifier.prefetch_jwks()
+    return verifier
 
 
@@ -1,26 +1,37 @@
+import atexit
 import httpx
 from typing import Dict, Optional
 from config import REQUEST_TIMEOUT
 
 
+# One pooled client for all downstream calls so keep-alive connections are reused
+_CLIENT = httpx.Client(
+    http2=True,
+    timeout=REQUEST_TIMEOUT,
+    limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+)
+atexit.register(_CLIENT.close)
+
+
 def _auth_headers(incoming_headers: Dict[str, str]) -> Dict[str, str]:
     auth = incoming_headers.get("Authorization")
     return {"Authorization": auth} if auth else {}
 
 
 def post_json(url: str, payload: dict, headers: Dict[str, str]):
-    with httpx.Client(timeout=REQUEST_TIMEOUT) as client:
-        return client.post(url, json=payload, headers=headers)
+    return _CLIENT.post(url, json=payload, headers=headers)
 
 
 def get_json(url: str, headers: Dict[str, str]):
-    with httpx.Client(timeout=REQUEST_TIMEOUT) as client:
-        return client.get(url, headers=headers)
+    return _CLIENT.get(url, headers=headers)
 
 
 def request_json(method: str, url: str, headers: Dict[str, str],
-                 json: Optional[dict] = None, params: Optional[dict] = None):
+                 json: Optional[dict] = None, params: Optional[dict] = None,
+                 content: Optional[bytes] = None):
+    """Send ``json`` encoded by httpx, or ``content`` as an already-encoded JSON body."""
     method_upper = (method or "GET").upper()
-    with httpx.Client(timeout=REQUEST_TIMEOUT) as client:
-        return client.request(method_upper, url, headers=headers, json=json, params=params)
-
+    if content is not None:
+        headers = {**headers, "Content-Type": "application/json"}
+    return _CLIENT.request(method_upper, url, headers=headers, json=json,
+                           params=params, content=content)
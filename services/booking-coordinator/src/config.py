@@ -1,20 +1,46 @@
 import os
+from dataclasses import dataclass
 
 
-AWS_REGION = os.environ.get("AWS_REGION", "ap-southeast-1")
-# Service base URLs
-ADMIN_SERVICE_URL = os.environ.get("ADMIN_SERVICE_URL", "http://admin.tickets.local:8081")
-BOOKING_SERVICE_URL = os.environ.get("BOOKING_SERVICE_URL", "http://ticket-booking-service.tickets.local:8084")
-# BOOKING_SERVICE_URL = os.environ.get("BOOKING_SERVICE_URL", "http://10.0.11.26:8084")
-PAYMENT_SERVICE_URL = os.environ.get("PAYMENT_SERVICE_URL", "http://payments.tickets.local:8083")
-NOTIFICATION_SERVICE_URL = os.environ.get("NOTIFICATION_SERVICE_URL", "http://notifications.tickets.local:8082")
+@dataclass(frozen=True, slots=True)
+class Config:
+    aws_region: str
+    # Service base URLs
+    admin_service_url: str
+    booking_service_url: str
+    payment_service_url: str
+    notification_service_url: str
+    sqs_queue_url: str
+    sqs_notification_queue_url: str
+    # Networking and resiliency
+    request_timeout: float
+    retry_max_attempts: int
 
-SQS_QUEUE_URL = os.environ.get("SQS_QUEUE_URL", "https://sqs.ap-southeast-1.amazonaws.com/375039967321/booking-requests.fifo")
 
-SQS_NOTIFICATION_QUEUE_URL = os.environ.get("NOTIFICATIONS_QUEUE_URL", "https://sqs.ap-southeast-1.amazonaws.com/375039967321/notifications-queue")
+def _load() -> Config:
+    """Read every setting from the environment once, with casts applied."""
+    env = os.environ
+    return Config(
+        aws_region=env.get("AWS_REGION", "ap-southeast-1"),
+        admin_service_url=env.get("ADMIN_SERVICE_URL", "http://admin.tickets.local:8081"),
+        booking_service_url=env.get("BOOKING_SERVICE_URL", "http://ticket-booking-service.tickets.local:8084"),
+        payment_service_url=env.get("PAYMENT_SERVICE_URL", "http://payments.tickets.local:8083"),
+        notification_service_url=env.get("NOTIFICATION_SERVICE_URL", "http://notifications.tickets.local:8082"),
+        sqs_queue_url=env.get("SQS_QUEUE_URL", "https://sqs.ap-southeast-1.amazonaws.com/375039967321/booking-requests.fifo"),
+        sqs_notification_queue_url=env.get("NOTIFICATIONS_QUEUE_URL", "https://sqs.ap-southeast-1.amazonaws.com/375039967321/notifications-queue"),
+        request_timeout=float(env.get("REQUEST_TIMEOUT_MS", "5000")) / 1000.0,
+        retry_max_attempts=int(env.get("RETRY_MAX_ATTEMPTS", "3")),
+    )
 
-AWS_REGION = os.environ.get("AWS_REGION", "ap-southeast-1")
-# Networking and resiliency
-REQUEST_TIMEOUT = float(os.environ.get("REQUEST_TIMEOUT_MS", "5000")) / 1000.0
-RETRY_MAX_ATTEMPTS = int(os.environ.get("RETRY_MAX_ATTEMPTS", "3"))
 
+CONFIG = _load()
+
+AWS_REGION = CONFIG.aws_region
+ADMIN_SERVICE_URL = CONFIG.admin_service_url
+BOOKING_SERVICE_URL = CONFIG.booking_service_url
+PAYMENT_SERVICE_URL = CONFIG.payment_service_url
+NOTIFICATION_SERVICE_URL = CONFIG.notification_service_url
+SQS_QUEUE_URL = CONFIG.sqs_queue_url
+SQS_NOTIFICATION_QUEUE_URL = CONFIG.sqs_notification_queue_url
+REQUEST_TIMEOUT = CONFIG.request_timeout
+RETRY_MAX_ATTEMPTS = CONFIG.retry_max_attempts
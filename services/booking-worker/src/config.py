@@ -1,21 +1,49 @@
-import os
-
-# Service URLs
-# Service Discovery URLs (works when running in ECS/VPC)
-# For local testing, override with environment variables pointing to localhost
-BOOKING_SERVICE_URL = os.environ.get("BOOKING_SERVICE_URL", "http://ticket-booking-service.tickets.local:8084")
-PAYMENT_SERVICE_URL = os.environ.get("PAYMENT_SERVICE_URL", "http://payments.tickets.local:8083")
-
-# SQS Configuration
-SQS_QUEUE_URL = os.environ.get("SQS_QUEUE_URL", "https://sqs.ap-southeast-1.amazonaws.com/375039967321/booking-requests.fifo")
-AWS_REGION = os.environ.get("AWS_REGION", "ap-southeast-1")
-
-# DynamoDB Configuration
-DYNAMODB_TABLE = os.environ.get("DYNAMODB_TABLE", "booking-requests-status")
-
-# Polling configuration
-POLL_INTERVAL = int(os.environ.get("POLL_INTERVAL", "1"))  # Seconds between polls
-MAX_MESSAGES = int(os.environ.get("MAX_MESSAGES", "1"))  # Process one at a time for strict FCFS
-WAIT_TIME = int(os.environ.get("WAIT_TIME", "20"))  # Long polling wait time
-VISIBILITY_TIMEOUT = int(os.environ.get("VISIBILITY_TIMEOUT", "60"))  # Should be > processing time
-
+import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    # Service Discovery URLs (works when running in ECS/VPC)
+    # For local testing, override with environment variables pointing to localhost
+    booking_service_url: str
+    payment_service_url: str
+    # SQS Configuration
+    sqs_queue_url: str
+    aws_region: str
+    # DynamoDB Configuration
+    dynamodb_table: str
+    # Polling configuration
+    poll_interval: int
+    max_messages: int
+    wait_time: int
+    visibility_timeout: int
+
+
+def _load() -> Config:
+    """Read every setting from the environment once, with casts applied."""
+    env = os.environ
+    return Config(
+        booking_service_url=env.get("BOOKING_SERVICE_URL", "http://ticket-booking-service.tickets.local:8084"),
+        payment_service_url=env.get("PAYMENT_SERVICE_URL", "http://payments.tickets.local:8083"),
+        sqs_queue_url=env.get("SQS_QUEUE_URL", "https://sqs.ap-southeast-1.amazonaws.com/375039967321/booking-requests.fifo"),
+        aws_region=env.get("AWS_REGION", "ap-southeast-1"),
+        dynamodb_table=env.get("DYNAMODB_TABLE", "booking-requests-status"),
+        poll_interval=int(env.get("POLL_INTERVAL", "1")),  # Seconds between polls
+        max_messages=int(env.get("MAX_MESSAGES", "10")),  # FCFS is kept per group by the consumers
+        wait_time=int(env.get("WAIT_TIME", "20")),  # Long polling wait time
+        visibility_timeout=int(env.get("VISIBILITY_TIMEOUT", "90")),  # > one message: two HTTP calls at HTTP_TIMEOUT; restarted per message
+    )
+
+
+CONFIG = _load()
+
+BOOKING_SERVICE_URL = CONFIG.booking_service_url
+PAYMENT_SERVICE_URL = CONFIG.payment_service_url
+SQS_QUEUE_URL = CONFIG.sqs_queue_url
+AWS_REGION = CONFIG.aws_region
+DYNAMODB_TABLE = CONFIG.dynamodb_table
+POLL_INTERVAL = CONFIG.poll_interval
+MAX_MESSAGES = CONFIG.max_messages
+WAIT_TIME = CONFIG.wait_time
+VISIBILITY_TIMEOUT = CONFIG.visibility_timeout
@@ -1,66 +1,152 @@
 """
 Worker service that polls SQS FIFO queue and processes booking requests in FCFS order.
 """
-import json
+import atexit
+import logging
+import logging.handlers
+import orjson
+import os
+import queue
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import boto3
+from botocore.config import Config
 import requests
-from datetime import datetime, UTC
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from decimal import Decimal
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from config import (
     BOOKING_SERVICE_URL, PAYMENT_SERVICE_URL, SQS_QUEUE_URL,
     AWS_REGION, DYNAMODB_TABLE, MAX_MESSAGES, WAIT_TIME, VISIBILITY_TIMEOUT
 )
 
-# Initialize AWS clients
-sqs = boto3.client('sqs', region_name=AWS_REGION)
-dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+# Log records go through a queue; a listener thread does the formatting and stdout
+# writes so consumer threads never block on the stream.
+_log_queue: queue.Queue = queue.Queue(-1)
+_log_stream = logging.StreamHandler(sys.stdout)
+_log_stream.setFormatter(logging.Formatter("%(asctime)s %(threadName)s %(levelname)s %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+logging.basicConfig(
+    level=os.environ.get("LOG_LEVEL", "INFO"),
+    # QueueHandler pre-renders the message; the listener's handler adds the prefix
+    format="%(message)s",
+    handlers=[logging.handlers.QueueHandler(_log_queue)],
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+log = logging.getLogger("worker")
+
+# Initialize AWS clients. Group consumers and the status executor share these,
+# so the pool is sized above botocore's default of 10. The read timeout has to
+# outlast the SQS long poll.
+AWS_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    connect_timeout=3,
+    read_timeout=WAIT_TIME + 5,
+)
+sqs = boto3.client('sqs', region_name=AWS_REGION, config=AWS_CONFIG)
+dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION, config=AWS_CONFIG)
 status_table = dynamodb.Table(DYNAMODB_TABLE)
 
+# Keep-alive session shared by the booking and payment calls. Only connection
+# failures are retried here: a POST that reached the service may already have
+# booked, and failed messages are redelivered by SQS anyway.
+http = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2),
+)
+http.mount('http://', _adapter)
+http.mount('https://', _adapter)
+http.headers.update({'Content-Type': 'application/json'})
+# (connect, read) seconds
+HTTP_TIMEOUT = (3.05, 27)
+PAYMENT_INTENT_URL = f"{PAYMENT_SERVICE_URL}/api/payments/create-intent"
+
+
+_iso_second = (0, '')
+
 
-def update_status(request_id: str, status: str, data: Optional[Dict] = None, error: Optional[str] = None):
+def iso_now() -> str:
+    """
+    UTC ISO-8601 timestamp with microseconds, like datetime.now(UTC).isoformat().
+    The seconds part is formatted once per second and reused.
+    """
+    global _iso_second
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _iso_second
+    if cached_second != second:
+        prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second))
+        # Swap both halves in one assignment so other threads never see a mix
+        _iso_second = (second, prefix)
+    return f"{prefix}.{int((now - second) * 1_000_000):06d}+00:00"
+
+
+def convert_floats(obj):
+    """
+    Convert floats to Decimal for DynamoDB, recursing into dicts and lists.
+    """
+    if isinstance(obj, float):
+        return Decimal(str(obj))
+    if isinstance(obj, dict):
+        return {k: convert_floats(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [convert_floats(i) for i in obj]
+    return obj
+
+
+def update_status(request_id: str, status: str, data: Optional[Dict] = None, error: Optional[str] = None,
+                  writer=status_table):
     """
     Update booking request status in DynamoDB.
+    ``writer`` may collect items instead (see PendingStatusWrites) so a group's updates go out together.
     """
     try:
         item = {
             'request_id': request_id,
             'status': status,
-            'updated_at': datetime.now(UTC).isoformat()
+            'updated_at': iso_now()
         }
         
+        # Only the service responses in data can carry floats
         if data:
-            item['data'] = data
+            item['data'] = convert_floats(data)
         if error:
             item['error'] = error
         
-        # Convert floats to Decimal for DynamoDB
-        def convert_floats(obj):
-            if isinstance(obj, float):
-                return Decimal(str(obj))
-            if isinstance(obj, dict):
-                return {k: convert_floats(v) for k, v in obj.items()}
-            if isinstance(obj, list):
-                return [convert_floats(i) for i in obj]
-            return obj
-        
-        item = convert_floats(item)
-        status_table.put_item(Item=item)
-        print(f"✓ Updated status for {request_id}: {status}")
+        writer.put_item(Item=item)
+        log.debug("Updated status for %s: %s", request_id, status)
         
     except Exception as e:
-        print(f"✗ Failed to update status in DynamoDB: {str(e)}")
+        log.error("Failed to update status in DynamoDB: %s", e)
         # Don't raise - status update failure shouldn't fail the booking
 
 
+def booking_error_message(exc: Exception) -> str:
+    """
+    Map an exception raised while booking to the status error message.
+    """
+    if isinstance(exc, requests.exceptions.Timeout):
+        return 'Request timeout while processing booking'
+    if isinstance(exc, requests.exceptions.RequestException):
+        return f'Network error: {str(exc)}'
+    return f'Unexpected error: {str(exc)}'
+
+
 def process_booking(message_body: Dict[str, Any]) -> Dict[str, Any]:
     """
     Process a single booking request.
     Returns dict with 'success' flag and result data or error.
     """
     request_id = message_body.get('request_id')
-    print(f"Processing booking request: {request_id}")
+    log.info("Processing booking request: %s", request_id)
     
     try:
         # Extract data from message
@@ -71,76 +157,74 @@ def process_booking(message_body: Dict[str, Any]) -> Dict[str, Any]:
         currency = message_body['currency']
         seat_numbers = message_body.get('seat_numbers')
         
-        # Prepare headers (no auth needed if services use IAM roles)
-        headers = {
-            'Content-Type': 'application/json'
-        }
-        
         # 1) Create booking
         booking_url = f"{BOOKING_SERVICE_URL}/api/events/{event_id}/book"
-        booking_payload = {
-            "num_tickets": num_tickets,
-            "user_id": user_id
-        }
         if seat_numbers:
-            booking_payload["seat_numbers"] = seat_numbers
+            booking_payload = {
+                "num_tickets": num_tickets,
+                "user_id": user_id,
+                "seat_numbers": seat_numbers
+            }
+        else:
+            booking_payload = {
+                "num_tickets": num_tickets,
+                "user_id": user_id
+            }
         
-        print(f"  → Creating booking at: {booking_url}")
-        booking_response = requests.post(
+        log.debug("Creating booking at: %s", booking_url)
+        booking_response = http.post(
             booking_url,
-            json=booking_payload,
-            headers=headers,
-            timeout=30
+            data=orjson.dumps(booking_payload),
+            timeout=HTTP_TIMEOUT
         )
         
         if booking_response.status_code >= 400:
             error_msg = f"Booking failed: {booking_response.text}"
-            print(f"  ✗ {error_msg}")
+            log.warning("Booking %s failed: %s", request_id, error_msg)
             return {
                 'success': False,
                 'error': error_msg
             }
         
-        booking_data = booking_response.json()
-        booking = booking_data.get('booking') or booking_data
-        booking_id = booking.get('booking_id')
+        booking_data = orjson.loads(booking_response.content)
+        # The booking service wraps the record in "booking"; accept a bare record too
+        booking = booking_data.get('booking', booking_data) if isinstance(booking_data, dict) else None
+        booking_id = booking.get('booking_id') if isinstance(booking, dict) else None
         
         if not booking_id:
             error_msg = "No booking_id returned from booking service"
-            print(f"  ✗ {error_msg}")
+            log.warning("Booking %s failed: %s", request_id, error_msg)
             return {
                 'success': False,
                 'error': error_msg
             }
         
-        print(f"  ✓ Booking created: {booking_id}")
+        log.info("Booking created: %s", booking_id)
         
         # 2) Create payment intent
-        payment_url = f"{PAYMENT_SERVICE_URL}/api/payments/create-intent"
         payment_payload = {
             "booking_id": booking_id,
             "amount": amount,
             "currency": currency
         }
         
-        print(f"  → Creating payment intent at: {payment_url}")
-        payment_response = requests.post(
-            payment_url,
-            json=payment_payload,
-            headers=headers,
-            timeout=30
+        log.debug("Creating payment intent at: %s", PAYMENT_INTENT_URL)
+        payment_response = http.post(
+            PAYMENT_INTENT_URL,
+            data=orjson.dumps(payment_payload),
+            timeout=HTTP_TIMEOUT
         )
         
         if payment_response.status_code >= 400:
             error_msg = f"Payment intent failed: {payment_response.text}"
-            print(f"  ✗ {error_msg}")
+            log.warning("Booking %s failed: %s", request_id, error_msg)
             return {
                 'success': False,
                 'error': error_msg
             }
         
-        payment_data = payment_response.json()
-        print(f"  ✓ Payment intent created: {payment_data.get('payment_id')}")
+        payment_data = orjson.loads(payment_response.content)
+        log.info("Payment intent created: %s", payment_data.get('payment_id'))
         
         return {
             'success': True,
@@ -148,53 +232,229 @@ def process_booking(message_body: Dict[str, Any]) -> Dict[str, Any]:
             'payment': payment_data
         }
         
-    except requests.exceptions.Timeout:
-        error_msg = 'Request timeout while processing booking'
-        print(f"  ✗ {error_msg}")
-        return {
-            'success': False,
-            'error': error_msg
-        }
-    except requests.exceptions.RequestException as e:
-        error_msg = f'Network error: {str(e)}'
-        print(f"  ✗ {error_msg}")
-        return {
-            'success': False,
-            'error': error_msg
-        }
     except Exception as e:
-        error_msg = f'Unexpected error: {str(e)}'
-        print(f"  ✗ {error_msg}")
+        error_msg = booking_error_message(e)
+        log.warning("Booking %s failed: %s", request_id, error_msg)
         return {
             'success': False,
             'error': error_msg
         }
 
 
+def handle_message(message: Dict[str, Any], writer=status_table) -> bool:
+    """
+    Process one SQS message: booking and status update.
+    Returns True if the message should be deleted from the queue.
+    """
+    message_body_str = message['Body']
+    
+    try:
+        # Parse message body
+        message_body = orjson.loads(message_body_str)
+        request_id = message_body.get('request_id')
+        
+        # Process the booking
+        result = process_booking(message_body)
+        
+        if result['success']:
+            # Update status with success data
+            update_status(
+                request_id,
+                'completed',
+                data={
+                    'booking': result.get('booking'),
+                    'payment': result.get('payment')
+                },
+                writer=writer
+            )
+            log.info("Successfully processed %s", request_id)
+            # Acknowledge success
+            return True
+            
+        else:
+            # Update status with error
+            update_status(
+                request_id,
+                'failed',
+                error=result.get('error'),
+                writer=writer
+            )
+            
+            # Don't delete message - it will become visible again after visibility timeout
+            # This allows retry. After max retries, it goes to DLQ
+            log.warning("Processing failed for %s, message will retry: %s", request_id, result.get('error'))
+            
+    except orjson.JSONDecodeError as e:
+        log.error("Invalid JSON in message: %s", e)
+        # Delete malformed message to prevent infinite retries
+        return True
+        
+    except Exception as e:
+        log.exception("Error processing message: %s", e)
+        # Don't delete - let it retry
+    return False
+
+
+def delete_messages(messages: List[Dict[str, Any]]):
+    """
+    Acknowledge processed messages, up to 10 per DeleteMessageBatch call.
+    """
+    for start in range(0, len(messages), 10):
+        chunk = messages[start:start + 10]
+        result = sqs.delete_message_batch(
+            QueueUrl=SQS_QUEUE_URL,
+            Entries=[
+                {'Id': str(i), 'ReceiptHandle': message['ReceiptHandle']}
+                for i, message in enumerate(chunk)
+            ]
+        )
+        for failure in result.get('Failed', []):
+            # Left on the queue; it will be redelivered after the visibility timeout
+            log.error("Failed to delete message %s: %s", failure['Id'], failure.get('Message'))
+
+
+def extend_visibility(messages: List[Dict[str, Any]]) -> bool:
+    """
+    Restart the visibility timeout on the messages still waiting in a group's slice,
+    so the tail of a slice is not redelivered while earlier messages are booked.
+    Returns False if the first message could not be extended.
+    """
+    try:
+        result = sqs.change_message_visibility_batch(
+            QueueUrl=SQS_QUEUE_URL,
+            Entries=[
+                {
+                    'Id': str(i),
+                    'ReceiptHandle': message['ReceiptHandle'],
+                    'VisibilityTimeout': VISIBILITY_TIMEOUT,
+                }
+                for i, message in enumerate(messages)
+            ]
+        )
+    except Exception as e:
+        log.error("Failed to extend message visibility: %s", e)
+        return False
+    failed = result.get('Failed', [])
+    for failure in failed:
+        log.error("Failed to extend visibility of message %s: %s", failure['Id'], failure.get('Message'))
+    return all(failure['Id'] != '0' for failure in failed)
+
+
+class PendingStatusWrites(list):
+    """
+    Collects status items from update_status so a group's rows can be written together.
+    """
+
+    def put_item(self, Item: Dict[str, Any]):
+        self.append(Item)
+
+
+def write_statuses(items: List[Dict[str, Any]]):
+    """
+    Write status rows with BatchWriteItem (boto3 retries unprocessed items).
+    """
+    try:
+        with status_table.batch_writer(overwrite_by_pkeys=['request_id']) as batch:
+            for item in items:
+                batch.put_item(Item=item)
+    except Exception as e:
+        # Same policy as update_status: a failed status write doesn't fail the booking
+        log.error("Failed to write status batch to DynamoDB: %s", e)
+
+
+# DynamoDB status writes run here so they overlap the SQS batch delete
+STATUS_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="status")
+
+
+def handle_group_batch(messages: List[Dict[str, Any]]):
+    """
+    Process one group's messages from a receive in order, then ack them together.
+    Stops at the first failure: that message and the rest of the slice stay unacked,
+    so the retry is not overtaken by later bookings for the same event.
+    The status BatchWriteItem and the DeleteMessageBatch go out concurrently.
+    """
+    pending = PendingStatusWrites()
+    done = []
+    for i, message in enumerate(messages):
+        # The receive set the first message's timeout; later ones have been waiting
+        if i and not extend_visibility(messages[i:]):
+            break
+        if not handle_message(message, pending):
+            break
+        done.append(message)
+    status_write = STATUS_EXECUTOR.submit(write_statuses, pending) if pending else None
+    if done:
+        delete_messages(done)
+    if status_write is not None:
+        try:
+            status_write.result(timeout=10)
+        except TimeoutError:
+            log.warning("Status batch write still running after 10s")
+
+
+# -------------------------
+# Per-group consumers
+# -------------------------
+# MessageGroupId is the event_id, so FCFS only has to hold within a group. Each
+# group gets one consumer thread fed its slice of every receive, in order; different
+# events book in parallel. A consumer exits after sitting idle so finished events
+# don't pin threads.
+GROUP_IDLE_SECONDS = 60
+_group_queues: Dict[str, queue.Queue] = {}
+_group_lock = threading.Lock()
+
+
+def _consume_group(group_id: str, group_queue: queue.Queue):
+    while True:
+        try:
+            messages = group_queue.get(timeout=GROUP_IDLE_SECONDS)
+        except queue.Empty:
+            with _group_lock:
+                # dispatch() only enqueues under the lock, so nothing can slip in now
+                if group_queue.empty():
+                    del _group_queues[group_id]
+                    return
+            continue
+        try:
+            handle_group_batch(messages)
+        except Exception as e:
+            # Keep the consumer alive; unacked messages are redelivered after the visibility timeout
+            log.exception("Error handling messages for group %s: %s", group_id, e)
+
+
+def dispatch(group_id: str, messages: List[Dict[str, Any]]):
+    """
+    Hand a group's messages to its consumer, starting one if needed.
+    """
+    with _group_lock:
+        group_queue = _group_queues.get(group_id)
+        if group_queue is None:
+            group_queue = _group_queues[group_id] = queue.Queue()
+            threading.Thread(
+                target=_consume_group, args=(group_id, group_queue), daemon=True
+            ).start()
+        group_queue.put(messages)
+
+
 def poll_and_process():
     """
-    Main loop: Poll SQS FIFO queue and process messages in order.
-    This ensures FCFS processing.
+    Main loop: Poll SQS FIFO queue and hand messages to per-group consumers.
+    This ensures FCFS processing within each event.
     """
-    print("=" * 60)
-    print("Worker Service Started")
-    print("=" * 60)
-    print(f"Queue URL: {SQS_QUEUE_URL}")
-    print(f"Region: {AWS_REGION}")
-    print(f"Status Table: {DYNAMODB_TABLE}")
-    print(f"Max Messages: {MAX_MESSAGES}")
-    print(f"Wait Time: {WAIT_TIME}s (long polling)")
-    print(f"Visibility Timeout: {VISIBILITY_TIMEOUT}s")
-    print("-" * 60)
-    print(f"Polling for messages (long polling, {WAIT_TIME}s wait)...")
-    print("-" * 60)
+    log.info("Worker Service Started")
+    log.info("Queue URL: %s", SQS_QUEUE_URL)
+    log.info("Region: %s", AWS_REGION)
+    log.info("Status Table: %s", DYNAMODB_TABLE)
+    log.info("Max Messages: %s", MAX_MESSAGES)
+    log.info("Wait Time: %ss (long polling)", WAIT_TIME)
+    log.info("Visibility Timeout: %ss", VISIBILITY_TIMEOUT)
     
     while True:
         try:
             # Long polling (efficient, waits up to WAIT_TIME seconds)
             response = sqs.receive_message(
                 QueueUrl=SQS_QUEUE_URL,
-                MaxNumberOfMessages=MAX_MESSAGES,  # Process one at a time for strict FCFS
+                MaxNumberOfMessages=MAX_MESSAGES,
                 WaitTimeSeconds=WAIT_TIME,  # Long polling
                 VisibilityTimeout=VISIBILITY_TIMEOUT,
                 AttributeNames=['All']
@@ -206,76 +466,22 @@ def poll_and_process():
                 # No messages, continue polling
                 continue
             
+            # SQS returns a group's messages in order; keep that order per group
+            by_group: Dict[str, List[Dict[str, Any]]] = {}
             for message in messages:
-                receipt_handle = message['ReceiptHandle']
-                message_body_str = message['Body']
-                
-                try:
-                    # Parse message body
-                    message_body = json.loads(message_body_str)
-                    request_id = message_body.get('request_id')
-                    
-                    print(f"\n[{datetime.now(UTC).strftime('%H:%M:%S')}] Processing: {request_id}")
-                    
-                    # Update status to processing
-                    update_status(request_id, 'processing')
-                    
-                    # Process the booking
-                    result = process_booking(message_body)
-                    
-                    if result['success']:
-                        # Update status with success data
-                        update_status(
-                            request_id,
-                            'completed',
-                            data={
-                                'booking': result.get('booking'),
-                                'payment': result.get('payment')
-                            }
-                        )
-                        
-                        # Delete message from queue (acknowledge success)
-                        sqs.delete_message(
-                            QueueUrl=SQS_QUEUE_URL,
-                            ReceiptHandle=receipt_handle
-                        )
-                        print(f"  ✓ Successfully processed and deleted message")
-                        
-                    else:
-                        # Update status with error
-                        update_status(
-                            request_id,
-                            'failed',
-                            error=result.get('error')
-                        )
-                        
-                        # Don't delete message - it will become visible again after visibility timeout
-                        # This allows retry. After max retries, it goes to DLQ
-                        print(f"  ✗ Processing failed, message will retry: {result.get('error')}")
-                        
-                except json.JSONDecodeError as e:
-                    print(f"  ✗ Invalid JSON in message: {str(e)}")
-                    # Delete malformed message to prevent infinite retries
-                    sqs.delete_message(
-                        QueueUrl=SQS_QUEUE_URL,
-                        ReceiptHandle=receipt_handle
-                    )
-                    
-                except Exception as e:
-                    print(f"  ✗ Error processing message: {str(e)}")
-                    # Don't delete - let it retry
+                group_id = message.get('Attributes', {}).get('MessageGroupId', '')
+                by_group.setdefault(group_id, []).append(message)
+            for group_id, group_messages in by_group.items():
+                dispatch(group_id, group_messages)
                     
         except KeyboardInterrupt:
-            print("\n\n" + "=" * 60)
-            print("Worker service stopped by user")
-            print("=" * 60)
+            log.info("Worker service stopped by user")
             break
             
         except Exception as e:
-            print(f"Error in polling loop: {str(e)}")
+            log.error("Error in polling loop: %s", e)
             time.sleep(5)  # Wait before retrying
 
 
 if __name__ == "__main__":
     poll_and_process()
-
@@ -0,0 +1,24 @@
+# Gunicorn settings for the notification service container
+import fcntl
+
+bind = "0.0.0.0:8082"
+workers = 4
+worker_class = "gthread"
+threads = 8
+
+_POLLER_LOCK_PATH = "/tmp/notifications-sqs-poller.lock"
+
+
+def post_worker_init(worker):
+    # Only the worker holding the lock polls SQS. The lock goes away with its
+    # process, so the replacement gunicorn spawns picks the poller back up.
+    lock_file = open(_POLLER_LOCK_PATH, "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return
+    worker.sqs_poller_lock = lock_file
+
+    from notifications import start_sqs_poller
+    start_sqs_poller()
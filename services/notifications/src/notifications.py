@@ -1,73 +1,158 @@
 import json
+import logging
 import os
+import random
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 import requests
+from requests.adapters import HTTPAdapter
 from urllib import response
 import uuid
 import boto3
-from flask import Flask, request, jsonify
+from botocore.config import Config
+import orjson
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from twilio.rest import Client
 from decimal import Decimal
 from boto3.dynamodb.conditions import Key
 from datetime import datetime, timezone
 
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
+log = logging.getLogger(__name__)
+
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """orjson for request bodies and the small jsonify() replies."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        # jsonify() only returns string dicts here; reminders are encoded separately
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+# Notification payloads are small; reject anything larger before it is parsed
+app.config["MAX_CONTENT_LENGTH"] = 64 * 1024
 TWILIO_ACCOUNT_SID = os.environ.get("TWILIO_ACCOUNT_SID")
 TWILIO_AUTH_TOKEN = os.environ.get("TWILIO_AUTH_TOKEN")
 MAILJET_API_KEY = os.environ.get("MAILJET_API_KEY")
 MAILJET_SECRET_KEY = os.environ.get("MAILJET_SECRET_KEY")
 AWS_REGION = os.environ.get("AWS_REGION")
-dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+# One session for DynamoDB and SQS, pooled wide enough for request threads plus the poller's executor
+AWS_SESSION = boto3.session.Session(region_name=AWS_REGION)
+AWS_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "max_attempts": 10},
+)
+dynamodb = AWS_SESSION.resource("dynamodb", config=AWS_CONFIG)
 table_notifications = dynamodb.Table("notifications")
 table_notification_reminders = dynamodb.Table("notifications_reminder")
-sqs = boto3.client("sqs", region_name=os.environ.get("AWS_REGION"))
+sqs = AWS_SESSION.client("sqs", config=AWS_CONFIG)
 SQS_NOTIFICATIONS_QUEUE_URL = os.environ.get("SQS_NOTIFICATIONS_QUEUE_URL")
 
+# Shared Mailjet session so sends reuse pooled keep-alive connections
+MAILJET_SEND_URL = "https://api.mailjet.com/v3.1/send"
+MAILJET_SESSION = requests.Session()
+MAILJET_SESSION.auth = (MAILJET_API_KEY, MAILJET_SECRET_KEY)
+MAILJET_SESSION.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=50))
+# Bodies are pre-encoded with orjson and posted as data=
+MAILJET_SESSION.headers["Content-Type"] = "application/json"
+MAILJET_FROM = {"Email": "vishnul.2023@smu.edu.sg", "Name": "Your App"}
+MAILJET_REMINDER_FROM = {"Email": "vishnul.2023@smu.edu.sg", "Name": "Event Reminder"}
+
+# Twilio client, built on first SMS and reused (it raises without credentials)
+TWILIO_CLIENT = None
+
+
+def _twilio_client():
+    global TWILIO_CLIENT
+    if TWILIO_CLIENT is None:
+        TWILIO_CLIENT = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+    return TWILIO_CLIENT
+
+
+def _decimal_default(obj):
+    """orjson hook: DynamoDB numbers come back as Decimal; emit int or float."""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    raise TypeError
+
+
+# Required request fields per endpoint
+REQUIRED_EMAIL = frozenset({"email", "subject", "message"})
+REQUIRED_SMS = frozenset({"user_id", "phone_number", "message"})
+REQUIRED_PUSH = frozenset({
+    "user_id",
+    "notification_id",
+    "booking_id",
+    "event_id",
+    "notification_type",
+    "message",
+    "status",
+    "reminder_time",
+    "created_at",
+})
+REQUIRED_REMINDER = REQUIRED_PUSH | {"hide"}
 
 # Utility function to simulate sending a notification
-def send_notification(notification_type, data):
+def send_notification(notification_type, data, notification_id=None):
     # In real usage: integrate with email/SMS/push APIs (e.g., SendGrid, Twilio, Firebase)
-    notification_id = str(uuid.uuid4())
+    notification_id = notification_id or str(uuid.uuid4())
     status = "SENT"  # Simulate success
-    print(f"[{notification_type.upper()}] Notification sent to user {data.get('user_id')}")
+    log.info("[%s] Notification sent to user %s", notification_type.upper(), data.get("user_id"))
     return {"notification_id": notification_id, "status": status}
 
 
-@app.route("/health", methods=["GET"])
+# Probes hit this every few seconds, so the body is encoded once. The bytes match
+# what jsonify() used to produce here, trailing newline included.
+HEALTH_RESPONSE = (
+    orjson.dumps({"status": "Notification service is healthy"}) + b"\n",
+    200,
+    {"Content-Type": "application/json"},
+)
+
+
+@app.get("/health")
 def health_check():
-    return jsonify({"status": "Notification service is healthy"}), 200
+    """Liveness/health endpoint so clients can verify the service is up."""
+    return HEALTH_RESPONSE
 
 
 # --- 1. Send confirmation email ---
 @app.route("/api/notifications/email", methods=["POST"])
 def send_email():
-    data = request.get_json()
-    required_fields = ["email", "subject", "message"]
-
-    if not all(field in data for field in required_fields):
+    data = request.get_json(silent=True, cache=False)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Invalid JSON body"}), 400
+    if not REQUIRED_EMAIL.issubset(data):
         return jsonify({"error": "Missing required fields"}), 400
     
-    response = requests.post(
-        "https://api.mailjet.com/v3.1/send",
-        auth=(MAILJET_API_KEY, MAILJET_SECRET_KEY),
-        json={
+    response = MAILJET_SESSION.post(
+        MAILJET_SEND_URL,
+        data=orjson.dumps({
             "Messages": [{
-                "From": {"Email": "vishnul.2023@smu.edu.sg", "Name": "Your App"},
+                "From": MAILJET_FROM,
                 "To": [{"Email": data["email"]}],
                 "Subject": data["subject"],
                 "TextPart": data["message"]
             }]
-        }
+        })
     )
 
     if response.status_code == 200:
-        response = send_notification("email", data)
         notification_id = str(uuid.uuid4())
+        response = send_notification("email", data, notification_id)
         table_notifications.put_item(
         Item={
                 "notification_id": notification_id,
-                "user_id": data.get("user_id", str(uuid.uuid4())),  # optional fallback
+                "user_id": data["user_id"] if "user_id" in data else str(uuid.uuid4()),  # optional fallback
                 "type": "EMAIL",
                 "message": data["message"],
                 "status": "SENT",
@@ -82,14 +167,13 @@ def send_email():
 # --- 2. Send SMS update ---
 @app.route("/api/notifications/sms", methods=["POST"])
 def send_sms():
-    data = request.get_json()
-    required_fields = ["user_id", "phone_number", "message"]
-
-    if not all(field in data for field in required_fields):
+    data = request.get_json(silent=True, cache=False)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Invalid JSON body"}), 400
+    if not REQUIRED_SMS.issubset(data):
         return jsonify({"error": "Missing required fields"}), 400
 
-    client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-    message = client.messages.create(
+    message = _twilio_client().messages.create(
         body=data["message"],
         from_='+16077033565',
         to=data["phone_number"]
@@ -107,25 +191,17 @@ def send_sms():
         }
     )
 
-    response = send_notification("sms", data)
+    response = send_notification("sms", data, notification_id)
     return jsonify(response), 200
 
 
 # --- 3. Send push notification ---
 @app.route("/api/notifications/push", methods=["POST"])
 def send_push():
-    data = request.get_json()
-    required_fields = ["user_id",
-                       "notification_id",
-                       "booking_id",
-                       "event_id",
-                       "notification_type",
-                       "message",
-                       "status",
-                       "reminder_time",
-                       "created_at"]
-
-    if not all(field in data for field in required_fields):
+    data = request.get_json(silent=True, cache=False)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Invalid JSON body"}), 400
+    if not REQUIRED_PUSH.issubset(data):
         return jsonify({"error": "Missing required fields"}), 400
     
 
@@ -141,7 +217,7 @@ def send_push():
         }
     )
 
-    response = send_notification("push", data)
+    response = send_notification("push", data, notification_id)
     return jsonify(response), 200
 
 
@@ -153,51 +229,37 @@ def get_reminders():
     if not user_id:
         return jsonify({"error": "Missing required field: user_id"}), 400
 
-    print(f"Fetching reminders for user_id: {user_id}")
+    log.debug("Fetching reminders for user_id: %s", user_id)
     try:
-        response = table_notification_reminders.query(
-            IndexName="user_id-index",
-            KeyConditionExpression=Key("user_id").eq(user_id)
-        )
-
+        query_kwargs = {
+            "IndexName": "user_id-index",
+            "KeyConditionExpression": Key("user_id").eq(user_id),
+        }
+        # A single Query page stops at 1 MB, so follow LastEvaluatedKey to the end
+        response = table_notification_reminders.query(**query_kwargs)
         reminders = response.get("Items", [])
-        print(f"Reminders fetched: {reminders}")
-
-        # Convert Decimal to float/int for JSON serialization
-        def convert_decimals(obj):
-            if isinstance(obj, list):
-                return [convert_decimals(i) for i in obj]
-            elif isinstance(obj, dict):
-                return {k: convert_decimals(v) for k, v in obj.items()}
-            elif isinstance(obj, Decimal):
-                return int(obj) if obj % 1 == 0 else float(obj)
-            return obj
-        
-        return jsonify(convert_decimals(reminders)), 200
+        while "LastEvaluatedKey" in response:
+            response = table_notification_reminders.query(
+                ExclusiveStartKey=response["LastEvaluatedKey"], **query_kwargs
+            )
+            reminders.extend(response.get("Items", []))
+        log.debug("Fetched %d reminder(s) for user_id: %s", len(reminders), user_id)
+
+        return Response(orjson.dumps(reminders, default=_decimal_default), status=200,
+                        mimetype="application/json")
     except Exception as e:
         # If index doesn't exist or no data for user, return empty array
-        print(f"Error fetching reminders: {str(e)}")
+        log.warning("Error fetching reminders: %s", e)
         return jsonify([]), 200
 
 
 # --- 4. Set reminder notification ---
 @app.route("/api/notifications/setreminder", methods=["POST"])
 def set_reminder():
-    data = request.get_json()
-    required_fields = [
-        "user_id",
-        "notification_id",
-        "booking_id",
-        "event_id",
-        "notification_type",
-        "message",
-        "status",
-        "reminder_time",
-        "created_at",
-        "hide"
-    ]
-
-    if not all(field in data for field in required_fields):
+    data = request.get_json(silent=True, cache=False)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Invalid JSON body"}), 400
+    if not REQUIRED_REMINDER.issubset(data):
         return jsonify({"error": "Missing required fields"}), 400
     
 
@@ -224,22 +286,23 @@ def set_reminder():
 
 @app.route("/api/notifications/setreminder/<reminder_id>", methods=["PATCH"])
 def update_reminder(reminder_id):
-    data = request.get_json()
-    update_expression = "SET "
+    data = request.get_json(silent=True, cache=False)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Invalid JSON body"}), 400
+    # Placeholders for every attribute name, so reserved words like status/type/hide work
+    set_clauses = []
+    expression_attribute_names = {}
     expression_attribute_values = {}
-    first = True
-
-    for key, value in data.items():
-        if not first:
-            update_expression += ", "
-        update_expression += f"{key} = :{key}"
-        expression_attribute_values[f":{key}"] = value
-        first = False
+    for i, (key, value) in enumerate(data.items()):
+        set_clauses.append(f"#k{i} = :v{i}")
+        expression_attribute_names[f"#k{i}"] = key
+        expression_attribute_values[f":v{i}"] = value
 
     try:
         table_notification_reminders.update_item(
             Key={"reminder_id": reminder_id},
-            UpdateExpression=update_expression,
+            UpdateExpression="SET " + ", ".join(set_clauses),
+            ExpressionAttributeNames=expression_attribute_names,
             ExpressionAttributeValues=expression_attribute_values
         )
     except Exception as e:
@@ -253,145 +316,179 @@ def update_reminder(reminder_id):
 
 # sqs polling to process notification jobs
 def send_email_from_queue(body):
-    """Send email directly from an SQS message payload via Mailjet."""
+    """Send email directly from an SQS message payload via Mailjet.
+
+    Returns the notification log item to write, or None if the send failed.
+    """
     try:
         email = body["email"]
         subject = f"Reminder: {body.get('title', 'Event')}"
         message = body["message"]
 
         # Send through Mailjet API
-        response = requests.post(
-            "https://api.mailjet.com/v3.1/send",
-            auth=(MAILJET_API_KEY, MAILJET_SECRET_KEY),
-            json={
+        response = MAILJET_SESSION.post(
+            MAILJET_SEND_URL,
+            data=orjson.dumps({
                 "Messages": [
                     {
-                        "From": {"Email": "vishnul.2023@smu.edu.sg", "Name": "Event Reminder"},
+                        "From": MAILJET_REMINDER_FROM,
                         "To": [{"Email": email}],
                         "Subject": subject,
                         "TextPart": message
                     }
                 ]
-            },
+            }),
             timeout=10
         )
 
         if response.status_code == 200:
-            print(f"[EMAIL] Sent queued email to {email}")
-            # Log to DynamoDB
-            table_notifications.put_item(
-                Item={
-                    "notification_id": str(uuid.uuid4()),
-                    "user_id": body.get("user_id", "unknown"),
-                    "type": "EMAIL",
-                    "message": message,
-                    "status": "SENT",
-                    "created_at": datetime.now(timezone.utc).isoformat()
-                }
-            )
-        else:
-            print(f"❌ [EMAIL] Failed to send via Mailjet ({response.status_code}): {response.text}")
+            log.info("[EMAIL] Sent queued email to %s", email)
+            return {
+                "notification_id": str(uuid.uuid4()),
+                "user_id": body.get("user_id", "unknown"),
+                "type": "EMAIL",
+                "message": message,
+                "status": "SENT",
+                "created_at": datetime.now(timezone.utc).isoformat()
+            }
+        log.error("[EMAIL] Failed to send via Mailjet (%s): %s", response.status_code, response.text)
 
     except Exception as e:
-        print(f"[ERROR] Failed to send email from queue: {e}")
+        log.error("Failed to send email from queue: %s", e)
+    return None
 
 
 
 def send_sms_from_queue(body):
-    """Send SMS directly from an SQS message payload via Twilio."""
+    """Send SMS directly from an SQS message payload via Twilio.
+
+    Returns the notification log item to write, or None if the send failed.
+    """
     try:
         phone_number = body["phone_number"]
         message_text = body["message"]
 
-        # Initialize Twilio client
-        client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-        twilio_message = client.messages.create(
+        twilio_message = _twilio_client().messages.create(
             body=message_text,
             from_="+16077033565",  # your Twilio number
             to=phone_number
         )
 
-        print(f"✅ [SMS] Sent queued SMS to {phone_number} (SID={twilio_message.sid})")
+        log.info("[SMS] Sent queued SMS to %s (SID=%s)", phone_number, twilio_message.sid)
 
-        # Log to DynamoDB
-        table_notifications.put_item(
-            Item={
-                "notification_id": str(uuid.uuid4()),
-                "user_id": body.get("user_id", "unknown"),
-                "type": "SMS",
-                "message": message_text,
-                "status": "SENT",
-                "created_at": datetime.now(timezone.utc).isoformat()
-            }
-        )
+        return {
+            "notification_id": str(uuid.uuid4()),
+            "user_id": body.get("user_id", "unknown"),
+            "type": "SMS",
+            "message": message_text,
+            "status": "SENT",
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
 
     except Exception as e:
-        print(f"[ERROR] Failed to send SMS from queue: {e}")
+        log.error("Failed to send SMS from queue: %s", e)
+    return None
+
+
+
+def push_from_queue(body):
+    """Record a push notification from an SQS message payload; nothing to log."""
+    send_notification("push", body)
+    return None
+
 
+# Queue message type -> channel handler; anything unrecognised is treated as push
+QUEUE_HANDLERS = {
+    "EMAIL": send_email_from_queue,
+    "SMS": send_sms_from_queue,
+}
+
+
+# Workers for the SQS poller; a receive returns at most 10 messages
+EXECUTOR = ThreadPoolExecutor(max_workers=16)
+
+
+def _handle_message(msg):
+    """Parse one SQS message and route it to its notification channel.
+
+    Returns the DynamoDB log item for a sent email/SMS, otherwise None.
+    """
+    body = json.loads(msg["Body"])
+    log.debug("[SQS] Received message: %s", body)
+
+    # Route to appropriate notification channel
+    return QUEUE_HANDLERS.get(body.get("type"), push_from_queue)(body)
 
 
 def poll_sqs_messages():
     """Continuously poll the SQS queue for new notification jobs."""
-    print("[INFO] Starting SQS polling loop for notifications...")
+    log.info("Starting SQS polling loop for notifications...")
 
+    error_backoff = 1
     while True:
         try:
+            # 20s is the SQS long-poll maximum, so an idle queue costs fewest receives
             response = sqs.receive_message(
                 QueueUrl=SQS_NOTIFICATIONS_QUEUE_URL,
                 MaxNumberOfMessages=10,
-                WaitTimeSeconds=15
+                WaitTimeSeconds=20
             )
+            error_backoff = 1
 
-            print("[DEBUG] SQS raw response:", response)
-
+            log.debug("SQS raw response: %s", response)
 
             messages = response.get("Messages", [])
             if not messages:
-                print("[SQS] No messages, sleeping...")
-                time.sleep(5)
-                continue  # No messages right now, keep polling
-
-
-            for msg in messages:
+                continue  # Long poll came back empty, poll again
+
+
+            # Mailjet/Twilio calls are network-bound, so the batch is handled in parallel
+            futures = {EXECUTOR.submit(_handle_message, msg): msg for msg in messages}
+            wait(futures)
+
+            processed = []
+            log_items = []
+            for future, msg in futures.items():
+                error = future.exception()
+                if error is not None:
+                    log.error("Processing SQS message failed: %s", error)
+                    continue
+                # Delete after success; failed messages reappear after the visibility timeout
+                processed.append({"Id": msg["MessageId"], "ReceiptHandle": msg["ReceiptHandle"]})
+                if future.result() is not None:
+                    log_items.append(future.result())
+
+            # Log the batch's sent notifications with one BatchWriteItem
+            if log_items:
                 try:
-                    body = json.loads(msg["Body"])
-                    print(f"[SQS] Received message: {body}")
-
-                    # Route to appropriate notification channel
-                    if body.get("type") == "EMAIL":
-                        send_email_from_queue(body)
-                        print("Sending email from queue")
-                    elif body.get("type") == "SMS":
-                        send_sms_from_queue(body)
-                    else:
-                        send_notification("push", body)
-
-                    # Delete message after success
-                    sqs.delete_message(
-                        QueueUrl=SQS_NOTIFICATIONS_QUEUE_URL,
-                        ReceiptHandle=msg["ReceiptHandle"]
-                    )
-                    print(f"[SQS] Deleted message: {msg['MessageId']}")
+                    with table_notifications.batch_writer() as batch:
+                        for item in log_items:
+                            batch.put_item(Item=item)
                 except Exception as e:
-                    print(f"[ERROR] Processing SQS message failed: {e}")
+                    log.error("Failed to log queued notifications: %s", e)
+
+            if processed:
+                result = sqs.delete_message_batch(
+                    QueueUrl=SQS_NOTIFICATIONS_QUEUE_URL,
+                    Entries=processed
+                )
+                log.info("[SQS] Deleted %d message(s)", len(result.get("Successful", [])))
+                for failure in result.get("Failed", []):
+                    log.error("Failed to delete message %s: %s", failure["Id"], failure.get("Message"))
 
         except Exception as e:
-            print(f"[ERROR] SQS polling error: {e}")
-            time.sleep(5)
+            log.error("SQS polling error: %s", e)
+            # Exponential backoff with jitter so throttling or outages don't hammer SQS
+            time.sleep(min(error_backoff + random.random(), 30))
+            error_backoff = min(error_backoff * 2, 30)
 
 
-@app.get("/health")
-def healthz():
-    """Liveness/health endpoint so clients can verify the service is up."""
-    print("Health check from Notification Service!")
-    return jsonify({
-        "status": "ok",
-        "service": "notification"
-    }), 200
-
+def start_sqs_poller():
+    """Start the background SQS poller; call once per deployment, not per worker."""
+    threading.Thread(target=poll_sqs_messages, daemon=True).start()
 
-threading.Thread(target=poll_sqs_messages, daemon=True).start()
 
 if __name__ == "__main__":
-
-    app.run(debug=True, host="0.0.0.0", port=8082)
+    # Local run; in the container gunicorn serves the app and starts the poller
+    start_sqs_poller()
+    app.run(host="0.0.0.0", port=8082)
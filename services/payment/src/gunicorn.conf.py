@@ -0,0 +1,8 @@
+# Gunicorn settings for the payment service container
+bind = "0.0.0.0:8083"
+workers = 2
+# Handlers are one Stripe call plus one DynamoDB call; greenlets keep a worker
+# serving other requests while those sockets wait. The gevent worker patches
+# the stdlib itself before the app is imported.
+worker_class = "gevent"
+worker_connections = 1000
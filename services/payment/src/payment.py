@@ -1,16 +1,27 @@
 from datetime import datetime, timezone
 from decimal import Decimal
-from boto3.dynamodb.conditions import Key
 from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import stripe
+import orjson
 import os
+import threading
+import time
 import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.config import Config
 
 
 AWS_REGION = os.environ.get("AWS_REGION")
 STRIPE_SECRET_KEY = os.environ.get("STRIPE_SECRET_KEY")
 DYNAMODB_ENDPOINT = os.environ.get("DYNAMODB_ENDPOINT")
+# Keep pooled DynamoDB connections alive between requests, and retry throttles with backoff
+DYNAMODB_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={"mode": "adaptive", "max_attempts": 10},
+)
 
 # Use local DynamoDB if endpoint provided (for tests)
 if DYNAMODB_ENDPOINT:
@@ -19,30 +30,56 @@ if DYNAMODB_ENDPOINT:
         "dynamodb",
         region_name=AWS_REGION,
         endpoint_url=DYNAMODB_ENDPOINT,
+        config=DYNAMODB_CONFIG,
         aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID", "dummy"),
         aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY", "dummy"),
     )
 else:
     print("[INFO] Using AWS-hosted DynamoDB")
-    dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+    dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION, config=DYNAMODB_CONFIG)
 table = dynamodb.Table("payments")
 
 stripe.api_key = STRIPE_SECRET_KEY
 
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """orjson for jsonify() and request bodies."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        # Responses are flat str-keyed dicts of strings and numbers (Stripe error
+        # details are already parsed JSON), so no hooks or options are needed
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
+REQUIRED_CREATE_INTENT = frozenset({"booking_id", "amount", "currency"})
+
+
+def cents_to_dollars(cents: int) -> Decimal:
+    """Stripe amounts are integer cents; shift the exponent instead of dividing."""
+    return Decimal(cents).scaleb(-2)
+
 
 def get_payment_intent_id(booking_id: str):
     """Fetch the Stripe payment_intent_id for a booking from DynamoDB."""
     try:
+        # Query on the partition key works whether or not the table also has a sort key
         response = table.query(
-            KeyConditionExpression=Key("booking_id").eq(booking_id)
+            KeyConditionExpression=Key("booking_id").eq(booking_id),
+            ProjectionExpression="payment_id",
+            Limit=1,
         )
         items = response.get("Items", [])
         if not items:
             return None
-        return items[0].get("payment_intent_id")
+        return items[0].get("payment_id")
     except Exception as exc:
         print(f"Error querying DynamoDB: {exc}")
         return None
@@ -58,9 +95,7 @@ def health_check():
 def create_payment_intent():
     """Create a Stripe PaymentIntent and store a pending record."""
     data = request.get_json()
-    required_fields = ["booking_id", "amount", "currency"]
-
-    if not all(field in data for field in required_fields):
+    if not REQUIRED_CREATE_INTENT.issubset(data):
         return jsonify({"error": "Missing required fields"}), 400
 
     try:
@@ -73,13 +108,11 @@ def create_payment_intent():
 
         # Store initial payment record in DynamoDB
         # Note: booking_id is the partition key for easy lookup
-
-        amount_dollars = Decimal(intent.amount) / Decimal(100)
         table.put_item(
             Item={
                 "payment_id": intent.id,
                 "booking_id": intent.metadata.get("booking_id", "unknown"),
-                "amount": amount_dollars,
+                "amount": cents_to_dollars(intent.amount),
                 "currency": intent.currency.upper(),
                 "status": "pending",
                 "created_at": datetime.fromtimestamp(
@@ -112,10 +145,10 @@ def verify_payment_intent():
                 Item={
                     "payment_id": intent.id,
                     "booking_id": booking_id,
-                    "amount": Decimal(intent.amount) / Decimal(100),
+                    "amount": cents_to_dollars(intent.amount),
                     "currency": intent.currency.upper(),
                     "status": "completed",
-                    "created_at": str(datetime.utcnow()),
+                    "created_at": datetime.now(timezone.utc).isoformat(),
                 }
             )
             return jsonify({"message": "Payment verified and recorded"}), 200
@@ -189,22 +222,52 @@ def process_refund(booking_id):
         return jsonify({"error": "internal_error", "message": str(exc)}), 500
 
 
+# Clients poll payment status; a few seconds of staleness saves a Stripe call per poll
+STATUS_CACHE_TTL_SECONDS = 5.0
+STATUS_CACHE_MAX_ENTRIES = 50000
+_status_cache = {}
+_status_cache_lock = threading.Lock()
+
+
+def _cached_status(payment_id: str):
+    """Return a cached status body for ``payment_id`` if it has not expired."""
+    with _status_cache_lock:
+        entry = _status_cache.get(payment_id)
+        if entry is None:
+            return None
+        expires_at, body = entry
+        if expires_at <= time.monotonic():
+            del _status_cache[payment_id]
+            return None
+        return body
+
+
+def _store_status(payment_id: str, intent) -> dict:
+    """Build the status body for ``intent`` and cache it for a few seconds."""
+    body = {
+        "payment_id": payment_id,
+        "booking_id": intent.metadata.get("booking_id", "unknown"),
+        "status": intent.status.upper(),
+    }
+    with _status_cache_lock:
+        now = time.monotonic()
+        if len(_status_cache) >= STATUS_CACHE_MAX_ENTRIES:
+            for key in [k for k, (exp, _) in _status_cache.items() if exp <= now]:
+                del _status_cache[key]
+        if len(_status_cache) < STATUS_CACHE_MAX_ENTRIES:
+            _status_cache[payment_id] = (now + STATUS_CACHE_TTL_SECONDS, body)
+    return body
+
+
 @app.route("/api/bookings/status/<payment_id>", methods=["GET"])
 def check_payment_status(payment_id):
     """Retrieve the current status of a PaymentIntent."""
+    cached = _cached_status(payment_id)
+    if cached is not None:
+        return jsonify(cached), 200
     try:
         payment = stripe.PaymentIntent.retrieve(payment_id)
-        booking_id = payment.metadata.get("booking_id", "unknown")
-        return (
-            jsonify(
-                {
-                    "payment_id": payment_id,
-                    "booking_id": booking_id,
-                    "status": payment.status.upper(),
-                }
-            ),
-            200,
-        )
+        return jsonify(_store_status(payment_id, payment)), 200
     except Exception as exc:
         return jsonify({"error": str(exc)}), 404
 
@@ -1,3 +1,4 @@
+import base64
 import boto3
 from datetime import datetime, UTC
 from decimal import Decimal
@@ -12,25 +13,33 @@ events_table = dynamodb.Table('Events')
 event1 = {
     'event_id': '1',
     'title': 'Summer Music Festival',
-    'description': 'An amazing outdoor music festival featuring top \
-    artists from around the world. \
-    Enjoy live performances, food trucks, and great vibes!',
+    'description': (
+        'An amazing outdoor music festival featuring top artists from '
+        'around the world. Enjoy live performances, food trucks, and '
+        'great vibes!'
+    ),
     'venue': 'Central Park, Singapore',
     'date': '2025-07-15T18:00:00Z',
     'total_seats': Decimal('5000'),
     'price': Decimal('100.00'),
-    'event_image': 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iNDAwIiBoZ\
-    WlnaHQ9IjMwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj48cmVj\
-    dCB3aWR0aD0iNDAwIiBoZWlnaHQ9IjMwMCIgZmlsbD0iIzRBOTBFMiIvPjx0ZXh0IHg\
-    9IjUwJSIgeT0iNTAlIiBmb250LWZhbWlseT0iQXJpYWwiIGZvbnQtc2l6ZT0iMjQiIG\
-    ZpbGw9IndoaXRlIiB0ZXh0LWFuY2hvcj0ibWlkZGxlIiBkeT0iLjNlbSI+8J+OtiBNd\
-    XNpYyBGZXN0aXZhbDwvdGV4dD48L3N2Zz4=',
-    'venue_image': 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iNDAwIiBoZ\
-    WlnaHQ9IjMwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj48cmVj\
-    dCB3aWR0aD0iNDAwIiBoZWlnaHQ9IjMwMCIgZmlsbD0iIzJFOEI1NyIvPjx0ZXh0IHg\
-    9IjUwJSIgeT0iNTAlIiBmb250LWZhbWlseT0iQXJpYWwiIGZvbnQtc2l6ZT0iMjQiIG\
-    ZpbGw9IndoaXRlIiB0ZXh0LWFuY2hvcj0ibWlkZGxlIiBkeT0iLjNlbSI+8J+MsyBDZ\
-    W50cmFsIFBhcms8L3RleHQ+PC9zdmc+',
+    'event_image': (
+        'data:image/svg+xml;base64,'
+        'PHN2ZyB3aWR0aD0iNDAwIiBoZWlnaHQ9IjMwMCIgeG1sbnM9Imh0dHA6Ly93d3cu'
+        'dzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iNDAwIiBoZWlnaHQ9IjMwMCIg'
+        'ZmlsbD0iIzRBOTBFMiIvPjx0ZXh0IHg9IjUwJSIgeT0iNTAlIiBmb250LWZhbWls'
+        'eT0iQXJpYWwiIGZvbnQtc2l6ZT0iMjQiIGZpbGw9IndoaXRlIiB0ZXh0LWFuY2hv'
+        'cj0ibWlkZGxlIiBkeT0iLjNlbSI+8J+OtiBNdXNpYyBGZXN0aXZhbDwvdGV4dD48'
+        'L3N2Zz4='
+    ),
+    'venue_image': (
+        'data:image/svg+xml;base64,'
+        'PHN2ZyB3aWR0aD0iNDAwIiBoZWlnaHQ9IjMwMCIgeG1sbnM9Imh0dHA6Ly93d3cu'
+        'dzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iNDAwIiBoZWlnaHQ9IjMwMCIg'
+        'ZmlsbD0iIzJFOEI1NyIvPjx0ZXh0IHg9IjUwJSIgeT0iNTAlIiBmb250LWZhbWls'
+        'eT0iQXJpYWwiIGZvbnQtc2l6ZT0iMjQiIGZpbGw9IndoaXRlIiB0ZXh0LWFuY2hv'
+        'cj0ibWlkZGxlIiBkeT0iLjNlbSI+8J+MsyBDZW50cmFsIFBhcms8L3RleHQ+PC9z'
+        'dmc+'
+    ),
     'created_by': '123e4567-e89b-12d3-a456-426614174000',
     'created_at': datetime.now(UTC).isoformat()
 }
@@ -40,50 +49,74 @@ event1 = {
 event2 = {
     'event_id': '2',
     'title': 'Tech Conference 2025',
-    'description': 'Annual technology conference featuring industry \
-    leaders, keynote speeches, and networking opportunities. Topics \
-    include AI, Cloud Computing, and Web3.',
+    'description': (
+        'Annual technology conference featuring industry leaders, '
+        'keynote speeches, and networking opportunities. Topics '
+        'include AI, Cloud Computing, and Web3.'
+    ),
     'venue': 'Marina Bay Sands, Singapore',
     'date': '2025-09-20T09:00:00Z',
     'total_seats': Decimal('1000'),
     'price': Decimal('200.00'),
-    'event_image': 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iNDAwIi\
-    BoZWlnaHQ9IjMwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj\
-    48cmVjdCB3aWR0aD0iNDAwIiBoZWlnaHQ9IjMwMCIgZmlsbD0iIzlCNTlCNiIvPj\
-    x0ZXh0IHg9IjUwJSIgeT0iNTAlIiBmb250LWZhbWlseT0iQXJpYWwiIGZvbnQtc2\
-    l6ZT0iMjQiIGZpbGw9IndoaXRlIiB0ZXh0LWFuY2hvcj0ibWlkZGxlIiBkeT0iLN\
-    lbSI+8J+agCBUZWNoIENvbmZlcmVuY2U8L3RleHQ+PC9zdmc+',
-    'venue_image': 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iNDAwIi\
-    BoZWlnaHQ9IjMwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj\
-    48cmVjdCB3aWR0aD0iNDAwIiBoZWlnaHQ9IjMwMCIgZmlsbD0iI0U3NEMzQyIvPj\
-    x0ZXh0IHg9IjUwJSIgeT0iNTAlIiBmb250LWZhbWlseT0iQXJpYWwiIGZvbnQtc2\
-    l6ZT0iMjQiIGZpbGw9IndoaXRlIiB0ZXh0LWFuY2hvcj0ibWlkZGxlIiBkeT0iLj\
-    NlbSI+8J+PqyBNYXJpbmEgQmF5IFNhbmRzPC90ZXh0Pjwvc3ZnPg==',
+    'event_image': (
+        'data:image/svg+xml;base64,'
+        'PHN2ZyB3aWR0aD0iNDAwIiBoZWlnaHQ9IjMwMCIgeG1sbnM9Imh0dHA6Ly93d3cu'
+        'dzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iNDAwIiBoZWlnaHQ9IjMwMCIg'
+        'ZmlsbD0iIzlCNTlCNiIvPjx0ZXh0IHg9IjUwJSIgeT0iNTAlIiBmb250LWZhbWls'
+        'eT0iQXJpYWwiIGZvbnQtc2l6ZT0iMjQiIGZpbGw9IndoaXRlIiB0ZXh0LWFuY2hv'
+        'cj0ibWlkZGxlIiBkeT0iLjNlbSI+8J+agCBUZWNoIENvbmZlcmVuY2U8L3RleHQ+'
+        'PC9zdmc+'
+    ),
+    'venue_image': (
+        'data:image/svg+xml;base64,'
+        'PHN2ZyB3aWR0aD0iNDAwIiBoZWlnaHQ9IjMwMCIgeG1sbnM9Imh0dHA6Ly93d3cu'
+        'dzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iNDAwIiBoZWlnaHQ9IjMwMCIg'
+        'ZmlsbD0iI0U3NEMzQyIvPjx0ZXh0IHg9IjUwJSIgeT0iNTAlIiBmb250LWZhbWls'
+        'eT0iQXJpYWwiIGZvbnQtc2l6ZT0iMjQiIGZpbGw9IndoaXRlIiB0ZXh0LWFuY2hv'
+        'cj0ibWlkZGxlIiBkeT0iLjNlbSI+8J+PqyBNYXJpbmEgQmF5IFNhbmRzPC90ZXh0'
+        'Pjwvc3ZnPg=='
+    ),
     'created_by': '123e4567-e89b-12d3-a456-426614174000',
     'created_at': datetime.now(UTC).isoformat()
 }
 
 
-def add_sample_events():
-    try:
-        # Add Event 1
-        print("Adding Summer Music Festival...")
-        events_table.put_item(Item=event1)
-        print("✓ Summer Music Festival added successfully!")
+SAMPLE_EVENTS = [event1, event2]
+
+# Fail fast on a broken image literal rather than seeding an unreadable data URI
+for _event in SAMPLE_EVENTS:
+    for _field in ('event_image', 'venue_image'):
+        base64.b64decode(_event[_field].split(',', 1)[1], validate=True)
+
 
-        # Add Event 2
-        print("Adding Tech Conference 2025...")
-        events_table.put_item(Item=event2)
-        print("✓ Tech Conference 2025 added successfully!")
+def get_events(event_ids):
+    """Fetch events by id with BatchGetItem (100 keys per call), retrying unprocessed keys."""
+    items = []
+    for start in range(0, len(event_ids), 100):
+        request = {'Events': {'Keys': [{'event_id': event_id}
+                                       for event_id in event_ids[start:start + 100]]}}
+        while request:
+            response = dynamodb.batch_get_item(RequestItems=request)
+            items.extend(response['Responses'].get('Events', []))
+            request = response.get('UnprocessedKeys')
+    return items
+
+
+def add_sample_events(events=SAMPLE_EVENTS):
+    try:
+        # batch_writer sends up to 25 items per BatchWriteItem and retries unprocessed ones
+        with events_table.batch_writer(overwrite_by_pkeys=['event_id']) as batch:
+            for event in events:
+                print(f"Adding {event['title']}...")
+                batch.put_item(Item=event)
 
         print("\n" + "="*50)
-        print("Both sample events have been added to DynamoDB!")
+        print(f"{len(events)} sample event(s) have been added to DynamoDB!")
         print("="*50)
 
-        # Verify by scanning the table
+        # Verify by reading back just the keys we wrote
         print("\nVerifying events in database:")
-        response = events_table.scan()
-        for item in response['Items']:
+        for item in get_events([event['event_id'] for event in events]):
             print(f"\n- {item['title']}")
             print(f"  Venue: {item['venue']}")
             print(f"  Date: {item['date']}")
@@ -1,3 +1,4 @@
+import orjson
 import pytest
 from moto import mock_aws
 import boto3
@@ -6,10 +7,57 @@ from datetime import datetime, timezone
 import src.app as app_module
 
 
+# Events seeded into the mock table; restored after every test
+SEED_EVENTS = [
+    {
+        'event_id': '1',
+        'title': 'Rock Concert 2025',
+        'description': 'An electrifying night of live rock music with top local bands.',
+        'venue': 'Singapore Indoor Stadium',
+        'date': '2025-08-15T20:00:00Z',
+        'total_seats': Decimal('500'),
+        'price': Decimal('120.00'),
+        'event_image': 'data:image/svg+xml;base64,PHN2ZyB3aW...',
+        'venue_image': 'data:image/svg+xml;base64,PHN2ZyB3aW...',
+        'created_by': '111e4567-e89b-12d3-a456-426614174000',
+        'created_at': datetime.now(timezone.utc).isoformat()
+    },
+    {
+        'event_id': '2',
+        'title': 'Tech Conference 2025',
+        'description': 'Annual technology conference featuring industry '
+                       'leaders, keynote speeches, and networking opportunities. '
+                       'Topics include AI, Cloud Computing, and Web3.',
+        'venue': 'Marina Bay Sands, Singapore',
+        'date': '2025-09-20T09:00:00Z',
+        'total_seats': Decimal('1000'),
+        'price': Decimal('200.00'),
+        'event_image': 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iNDAwIi...',
+        'venue_image': 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iNDAwIi...',
+        'created_by': '123e4567-e89b-12d3-a456-426614174000',
+        'created_at': datetime.now(timezone.utc).isoformat()
+    },
+    {
+        'event_id': '3',
+        'title': 'Art Festival 2025',
+        'description': 'A vibrant showcase of art, music, and performance in the city.',
+        'venue': 'Esplanade Park, Singapore',
+        'date': '2025-10-10T18:00:00Z',
+        'total_seats': Decimal('300'),
+        'price': Decimal('80.00'),
+        'event_image': 'data:image/svg+xml;base64,PHN2ZyB3aW...',
+        'venue_image': 'data:image/svg+xml;base64,PHN2ZyB3aW...',
+        'created_by': '222e4567-e89b-12d3-a456-426614174000',
+        'created_at': datetime.now(timezone.utc).isoformat()
+    },
+]
+
+
 @pytest.fixture(scope="session")
 def mock_dynamodb_resource():
     """
     Creates an in-memory DynamoDB resource using moto.
+    The mock lives in the test process, so each pytest-xdist worker gets its own tables.
     """
     with mock_aws():
         dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
@@ -56,57 +104,25 @@ def mock_events_table(mock_dynamodb_resource):
     """
     table = mock_dynamodb_resource.Table("Events")
 
-    events = [
-        {
-            'event_id': '1',
-            'title': 'Rock Concert 2025',
-            'description': 'An electrifying night of live rock music with top local bands.',
-            'venue': 'Singapore Indoor Stadium',
-            'date': '2025-08-15T20:00:00Z',
-            'total_seats': Decimal('500'),
-            'price': Decimal('120.00'),
-            'event_image': 'data:image/svg+xml;base64,PHN2ZyB3aW...',
-            'venue_image': 'data:image/svg+xml;base64,PHN2ZyB3aW...',
-            'created_by': '111e4567-e89b-12d3-a456-426614174000',
-            'created_at': datetime.now(timezone.utc).isoformat()
-        },
-        {
-            'event_id': '2',
-            'title': 'Tech Conference 2025',
-            'description': 'Annual technology conference featuring industry '
-                           'leaders, keynote speeches, and networking opportunities. '
-                           'Topics include AI, Cloud Computing, and Web3.',
-            'venue': 'Marina Bay Sands, Singapore',
-            'date': '2025-09-20T09:00:00Z',
-            'total_seats': Decimal('1000'),
-            'price': Decimal('200.00'),
-            'event_image': 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iNDAwIi...',
-            'venue_image': 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iNDAwIi...',
-            'created_by': '123e4567-e89b-12d3-a456-426614174000',
-            'created_at': datetime.now(timezone.utc).isoformat()
-        },
-        {
-            'event_id': '3',
-            'title': 'Art Festival 2025',
-            'description': 'A vibrant showcase of art, music, and performance in the city.',
-            'venue': 'Esplanade Park, Singapore',
-            'date': '2025-10-10T18:00:00Z',
-            'total_seats': Decimal('300'),
-            'price': Decimal('80.00'),
-            'event_image': 'data:image/svg+xml;base64,PHN2ZyB3aW...',
-            'venue_image': 'data:image/svg+xml;base64,PHN2ZyB3aW...',
-            'created_by': '222e4567-e89b-12d3-a456-426614174000',
-            'created_at': datetime.now(timezone.utc).isoformat()
-        },
-    ]
-
     with table.batch_writer() as batch:
-        for e in events:
+        for e in SEED_EVENTS:
             batch.put_item(Item=e)
 
     return table
 
 
+@pytest.fixture(autouse=True)
+def restore_seed_events(mock_events_table):
+    """
+    Puts the seeded events back after each test, so edits and deletes made by one
+    test are not visible to the next. Other rows (new events, bookings) are left.
+    """
+    yield
+    with mock_events_table.batch_writer() as batch:
+        for e in SEED_EVENTS:
+            batch.put_item(Item=e)
+
+
 @pytest.fixture(scope="session")
 def mock_bookings_table(mock_dynamodb_resource):
     """
@@ -130,3 +146,18 @@ def test_client(mock_dynamodb_resource, mock_events_table, mock_bookings_table):
 
     with app_module.app.test_client() as client:
         yield client
+
+
+@pytest.fixture(scope="session")
+def post_json(test_client):
+    """
+    Returns a helper that POSTs a payload to the app as a JSON body.
+    """
+    def _post(url, payload, **kwargs):
+        return test_client.post(
+            url,
+            data=orjson.dumps(payload),
+            content_type='application/json',
+            **kwargs
+        )
+    return _post